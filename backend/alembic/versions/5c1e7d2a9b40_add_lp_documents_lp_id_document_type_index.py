@@ -0,0 +1,25 @@
+"""add_lp_documents_lp_id_document_type_index
+
+Revision ID: 5c1e7d2a9b40
+Revises: 34dc01a6362b
+Create Date: 2025-09-02 10:14:37.512904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7d2a9b40'
+down_revision = '34dc01a6362b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite index so the per-LP distinct document_type lookup is index-only
+    op.create_index('idx_lp_documents_lp_id_document_type', 'lp_documents', ['lp_id', 'document_type'])
+
+
+def downgrade():
+    op.drop_index('idx_lp_documents_lp_id_document_type', table_name='lp_documents')
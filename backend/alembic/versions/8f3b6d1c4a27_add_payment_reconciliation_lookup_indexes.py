@@ -0,0 +1,31 @@
+"""add_payment_reconciliation_lookup_indexes
+
+Revision ID: 8f3b6d1c4a27
+Revises: 5c1e7d2a9b40
+Create Date: 2025-09-04 11:02:18.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b6d1c4a27'
+down_revision = '5c1e7d2a9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Drawdown lookup and paid-status updates filter on fund, LP and quarter
+    op.create_index('idx_lp_drawdowns_fund_id_lp_id_drawdown_quarter', 'lp_drawdowns', ['fund_id', 'lp_id', 'drawdown_quarter'])
+    # Duplicate payment check matches on LP, quarter, date and amount
+    op.create_index('idx_lp_payments_lp_id_quarter_payment_date_paid_amount', 'lp_payments', ['lp_id', 'quarter', 'payment_date', 'paid_amount'])
+    # Reconciliation detail and delete paths select payments by reconciliation
+    op.create_index('idx_lp_payments_payment_id', 'lp_payments', ['payment_id'])
+
+
+def downgrade():
+    op.drop_index('idx_lp_payments_payment_id', table_name='lp_payments')
+    op.drop_index('idx_lp_payments_lp_id_quarter_payment_date_paid_amount', table_name='lp_payments')
+    op.drop_index('idx_lp_drawdowns_fund_id_lp_id_drawdown_quarter', table_name='lp_drawdowns')
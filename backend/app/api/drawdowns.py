@@ -1,7 +1,7 @@
 """
 Drawdown API endpoints for capital call management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, func, desc, asc
 from typing import List, Optional
@@ -149,23 +149,7 @@ def generate_drawdowns(
             db.flush()  # Flush to get the drawdown_id
             
             # Prepare data for PDF generation
-            pdf_data = {
-                'notice_date': request.notice_date.strftime('%Y-%m-%d'),
-                'investor': lp.lp_name,
-                'amount_due': float(amounts['drawdown_amount']),
-                'total_commitment': float(amounts['committed_amt']),
-                'amount_called_up': float(amounts['amount_called_up']),
-                'remaining_commitment': float(amounts['remaining_commitment']),
-                'contribution_due_date': request.due_date.strftime('%Y-%m-%d'),
-                'bank_name': fund.bank_name,
-                'ifsc': fund.bank_ifsc,
-                'acct_name': fund.bank_account_name,
-                'acct_number': fund.bank_account_no,
-                'bank_contact': fund.bank_contact_person,
-                'phone': fund.bank_contact_phone,
-                'forecast_next_quarter': float(request.forecast_next_quarter),
-                'forecast_next_quarter_period': forecast_next_quarter_period
-            }
+            pdf_data = DrawdownWithBankDetails.from_rows(drawdown, lp, fund).to_pdf_data()
             
             # Generate PDF
             try:
@@ -499,12 +483,14 @@ def list_drawdowns(
         if active_filters:
             logger.info(f"Drawdown list query with filters: {', '.join(active_filters)} - Results: {len(drawdowns)}/{total_count}")
         
-        return DrawdownListResponse(
+        response = DrawdownListResponse(
             drawdowns=[LPDrawdownResponse.model_validate(d) for d in drawdowns],
             total_count=total_count,
             skip=skip,
             limit=limit
         )
+        # Serialize here, inside the try, instead of having FastAPI re-validate the model
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error listing drawdowns: {str(e)}")
@@ -673,9 +659,6 @@ def update_drawdown(
         if not drawdown:
             raise HTTPException(status_code=404, detail=f"Drawdown {drawdown_id} not found")
         
-        # Valid status values (only validate if status is being updated)
-        valid_statuses = [status.value for status in DrawdownNoticeStatus]
-        
         # Track changes for response
         changes = {}
         
@@ -684,13 +667,6 @@ def update_drawdown(
         
         for field, value in update_data.items():
             if hasattr(drawdown, field):
-                # Special validation for status
-                if field == "status" and value not in valid_statuses:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Invalid status. Valid values are: {', '.join(valid_statuses)}"
-                    )
-                
                 old_value = getattr(drawdown, field)
                 if old_value != value:
                     setattr(drawdown, field, value)
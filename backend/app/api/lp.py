@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Dict, Any, Optional
+import asyncio
 import os
 import tempfile
 import shutil
@@ -511,25 +512,42 @@ async def create_lp(
             
             logger.info("All files saved successfully, starting document processing")
             
-            # Extract data from CA document
-            logger.info("Extracting text from CA document")
-            ca_text = processor.extract_document_text(ca_path, DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"])
-            logger.info(f"CA text extracted, length: {len(ca_text)} characters")
-            
-            logger.info("Processing CA document with LLM")
-            ca_data = processor.process_contribution_agreement(ca_text)
-            ca_fields = processor.map_ca_fields_to_lp(ca_data)
-            logger.info(f"CA processing complete, extracted fields: {list(ca_fields.keys())}")
+            # Extract and process CA and CML concurrently: PDF parsing runs in a worker
+            # thread and the two LLM calls are awaited together
+            async def extract_ca_fields():
+                logger.info("Extracting text from CA document")
+                ca_text = await asyncio.to_thread(
+                    processor.extract_document_text, ca_path, DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
+                )
+                logger.info(f"CA text extracted, length: {len(ca_text)} characters")
+                
+                logger.info("Processing CA document with LLM")
+                ca_data = await processor.aprocess_contribution_agreement(ca_text)
+                ca_fields = processor.map_ca_fields_to_lp(ca_data)
+                logger.info(f"CA processing complete, extracted fields: {list(ca_fields.keys())}")
+                return ca_fields
             
-            # Extract data from CML document
-            logger.info("Extracting text from CML document")
-            cml_text = processor.extract_document_text(cml_path, DOCUMENT_TYPES["CML"])
-            logger.info(f"CML text extracted, length: {len(cml_text)} characters")
+            async def extract_cml_fields():
+                logger.info("Extracting text from CML document")
+                cml_text = await asyncio.to_thread(
+                    processor.extract_document_text, cml_path, DOCUMENT_TYPES["CML"]
+                )
+                logger.info(f"CML text extracted, length: {len(cml_text)} characters")
+                
+                logger.info("Processing CML document with LLM")
+                cml_data = await processor.aprocess_cml_document(cml_text)
+                cml_fields = processor.map_cml_fields_to_lp(cml_data)
+                logger.info(f"CML processing complete, extracted fields: {list(cml_fields.keys())}")
+                return cml_fields
             
-            logger.info("Processing CML document with LLM")
-            cml_data = processor.process_cml_document(cml_text)
-            cml_fields = processor.map_cml_fields_to_lp(cml_data)
-            logger.info(f"CML processing complete, extracted fields: {list(cml_fields.keys())}")
+            # If one extraction fails, cancel the other instead of leaving it running
+            extraction_tasks = [asyncio.ensure_future(extract_ca_fields()), asyncio.ensure_future(extract_cml_fields())]
+            try:
+                ca_fields, cml_fields = await asyncio.gather(*extraction_tasks)
+            except BaseException:
+                for task in extraction_tasks:
+                    task.cancel()
+                raise
             
             # Combine data from both documents
             lp_data = {**ca_fields, **cml_fields}
@@ -662,11 +680,14 @@ async def create_lp(
                     document_type=DOCUMENT_TYPES["KYC"],
                     file_path=kyc_path,
                     drive_result=kyc_drive_result,
-                    expiry_date=kyc_expiry_date
+                    expiry_date=kyc_expiry_date,
+                    flush=False
                 )
                 logger.info(f"KYC document record created: {kyc_document.document_id}")
                 
-                processor.create_lp_document_association(new_lp.lp_id, kyc_document.document_id, DOCUMENT_TYPES["KYC"])
+                kyc_association = processor.create_lp_document_association(
+                    new_lp.lp_id, kyc_document.document_id, DOCUMENT_TYPES["KYC"], flush=False
+                )
                 logger.info("KYC document association created")
 
                 # Process CA document
@@ -684,11 +705,14 @@ async def create_lp(
                     document_type=DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"],
                     file_path=ca_path,
                     drive_result=ca_drive_result,
-                    expiry_date=ca_expiry_date
+                    expiry_date=ca_expiry_date,
+                    flush=False
                 )
                 logger.info(f"CA document record created: {ca_document.document_id}")
                 
-                processor.create_lp_document_association(new_lp.lp_id, ca_document.document_id, DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"])
+                ca_association = processor.create_lp_document_association(
+                    new_lp.lp_id, ca_document.document_id, DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"], flush=False
+                )
                 logger.info("CA document association created")
 
                 # Process CML document
@@ -706,13 +730,22 @@ async def create_lp(
                     document_type=DOCUMENT_TYPES["CML"],
                     file_path=cml_path,
                     drive_result=cml_drive_result,
-                    expiry_date=cml_expiry_date
+                    expiry_date=cml_expiry_date,
+                    flush=False
                 )
                 logger.info(f"CML document record created: {cml_document.document_id}")
                 
-                processor.create_lp_document_association(new_lp.lp_id, cml_document.document_id, DOCUMENT_TYPES["CML"])
+                cml_association = processor.create_lp_document_association(
+                    new_lp.lp_id, cml_document.document_id, DOCUMENT_TYPES["CML"], flush=False
+                )
                 logger.info("CML document association created")
 
+                # Write all three documents and associations in one flush
+                processor.flush_pending(
+                    [kyc_document, ca_document, cml_document],
+                    [kyc_association, ca_association, cml_association]
+                )
+
                 # Mark KYC status as Done
                 new_lp.kyc_status = "Done"
                 logger.info("KYC status marked as 'Done'")
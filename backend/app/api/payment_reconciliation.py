@@ -1,7 +1,7 @@
 """
 Payment Reconciliation API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File, Form, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, desc
 from typing import List, Optional, Dict, Any
@@ -162,6 +162,30 @@ def manual_record_payment(
         logger.error(f"Error recording manual payment: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error recording payment: {str(e)}")
 
+def _to_payment_response(payment: LPPayment) -> LPPaymentResponse:
+    """Build the list response entry for a single LP payment"""
+    # Get S3 link from payment reconciliation if available
+    payment_s3_link = None
+    if payment.payment_reconciliation:
+        payment_s3_link = payment.payment_reconciliation.payment_s3_link
+    
+    return LPPaymentResponse(
+        lp_payment_id=payment.lp_payment_id,
+        lp_id=str(payment.lp_id),
+        lp_name=payment.lp.lp_name,
+        drawdown_id=str(payment.drawdown_id),
+        payment_id=payment.payment_id,
+        payment_s3_link=payment_s3_link,
+        paid_amount=payment.paid_amount,
+        payment_date=payment.payment_date,
+        fund_id=payment.fund_id,
+        quarter=payment.quarter,
+        amount_due=payment.amount_due,
+        status=payment.status,
+        notes=payment.notes,
+        created_at=payment.created_at
+    )
+
 @router.get("/", response_model=PaymentReconciliationListResponse)
 def list_payment_reconciliations(
     fund_id: Optional[int] = Query(None, description="Filter by fund ID"),
@@ -215,39 +239,16 @@ def list_payment_reconciliations(
         # Apply pagination and ordering
         payments = query.order_by(desc(LPPayment.created_at)).offset(skip).limit(limit).all()
         
-        # Convert to response format
-        payment_responses = []
-        for payment in payments:
-            # Get S3 link from payment reconciliation if available
-            payment_s3_link = None
-            if payment.payment_reconciliation:
-                payment_s3_link = payment.payment_reconciliation.payment_s3_link
-            
-            payment_responses.append(LPPaymentResponse(
-                lp_payment_id=payment.lp_payment_id,
-                lp_id=str(payment.lp_id),
-                lp_name=payment.lp.lp_name,
-                drawdown_id=str(payment.drawdown_id),
-                payment_id=payment.payment_id,
-                payment_s3_link=payment_s3_link,
-                paid_amount=payment.paid_amount,
-                payment_date=payment.payment_date,
-                fund_id=payment.fund_id,
-                quarter=payment.quarter,
-                amount_due=payment.amount_due,
-                status=payment.status,
-                notes=payment.notes,
-                created_at=payment.created_at
-            ))
-        
-        logger.info(f"Listed {len(payment_responses)} payments out of {total_count} total")
-        
-        return PaymentReconciliationListResponse(
-            payments=payment_responses,
+        logger.info(f"Listed {len(payments)} payments out of {total_count} total")
+        
+        response = PaymentReconciliationListResponse(
+            payments=[_to_payment_response(payment) for payment in payments],
             total_count=total_count,
             skip=skip,
             limit=limit
         )
+        # Serialize here, inside the try, instead of having FastAPI re-validate the model
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error listing payments: {str(e)}")
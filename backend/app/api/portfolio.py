@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Dict, Any, Optional
+import asyncio
 import os
 import tempfile
 import shutil
@@ -173,12 +174,12 @@ async def onboard_portfolio_company(
             
             # Extract text from SHA document using specific pages
             logger.info("Extracting text from SHA document")
-            sha_text = processor.extract_document_text(sha_path, DOCUMENT_TYPES["SHA"])
+            sha_text = await asyncio.to_thread(processor.extract_document_text, sha_path, DOCUMENT_TYPES["SHA"])
             logger.info(f"SHA text extracted, length: {len(sha_text)} characters")
             
             # Process SHA document with LLM
             logger.info("Processing SHA document with LLM")
-            sha_data = processor.process_sha_document(sha_text)
+            sha_data = await processor.aprocess_sha_document(sha_text)
             extracted_fields = processor.map_sha_fields_to_portfolio(sha_data)
             logger.info(f"SHA processing complete, extracted fields: {list(extracted_fields.keys())}")
             
@@ -269,7 +270,8 @@ async def onboard_portfolio_company(
                 company.company_id,
                 document.document_id,
                 DOCUMENT_TYPES["SHA"],
-                doc_link=drive_link  # Use the extracted drive link
+                doc_link=drive_link,  # Use the extracted drive link
+                flush=False  # Written by the commit below
             )
             
             # Commit all changes
@@ -338,7 +340,7 @@ async def get_portfolio_companies(
     # Get paginated data
     companies = query.offset(skip).limit(limit).all()
     
-    return PortfolioCompanyListResponse(data=companies, total=total)
+    return PortfolioCompanyListResponse.from_orm_list(companies, total)
 
 @router.get("/search", response_model=PortfolioCompanyListResponse)
 async def search_portfolio_companies(
@@ -399,7 +401,7 @@ async def search_portfolio_companies(
     # Apply pagination
     companies = base_query.offset(skip).limit(limit).all()
     
-    return PortfolioCompanyListResponse(data=companies, total=total)
+    return PortfolioCompanyListResponse.from_orm_list(companies, total)
 
 # Portfolio Investments Management
 
@@ -423,7 +425,7 @@ async def get_portfolio_investments(
     # Get paginated data
     investments = query.offset(skip).limit(limit).all()
     
-    return PortfolioInvestmentListResponse(data=investments, total=total)
+    return PortfolioInvestmentListResponse.from_orm_list(investments, total)
 
 @router.get("/investments/{investment_id}", response_model=PortfolioInvestmentResponse)
 async def get_portfolio_investment(
@@ -589,7 +591,7 @@ async def get_company_founders(
     total = query.count()
     founders = query.offset(skip).limit(limit).all()
     
-    return PortfolioFounderListResponse(data=founders, total=total)
+    return PortfolioFounderListResponse.from_orm_list(founders, total)
 
 @router.put("/founders/{founder_id}", response_model=PortfolioFounderResponse)
 async def update_portfolio_founder(
@@ -659,7 +661,7 @@ async def get_company_documents(
     total = query.count()
     documents = query.offset(skip).limit(limit).all()
     
-    return PortfolioDocumentListResponse(data=documents, total=total)
+    return PortfolioDocumentListResponse.from_orm_list(documents, total)
 
 @router.post("/{company_id}/documents", response_model=PortfolioDocumentResponse, status_code=status.HTTP_201_CREATED)
 async def create_portfolio_document(
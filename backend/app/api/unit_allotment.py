@@ -8,7 +8,7 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, inspect
 
 from ..database.base import get_db
 from ..models.unit_allotment import UnitAllotment
@@ -22,15 +22,23 @@ from ..schemas.unit_allotment import (
     UnitAllotmentListResponse,
     UnitAllotmentFilter
 )
-from ..services.unit_calculator import UnitCalculationEngine
+from ..services.unit_calculator import default_engine
 from ..services.unit_allotment_excel_generator import UnitAllotmentExcelGenerator
 from ..utils.audit import log_activity
-from ..utils.s3_storage import S3DocumentStorage, extract_s3_key_from_url
+from ..utils.s3_storage import get_s3_storage, extract_s3_key_from_url
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/unit-allotments", tags=["Unit Allotment"])
 
+def _load_allotments(db: Session, allotment_ids: List[int]) -> List[UnitAllotment]:
+    """Load committed allotments with one query, in the order of allotment_ids"""
+    allotments_by_id = {
+        allotment.allotment_id: allotment
+        for allotment in db.query(UnitAllotment).filter(UnitAllotment.allotment_id.in_(allotment_ids))
+    }
+    return [allotments_by_id[allotment_id] for allotment_id in allotment_ids]
+
 @router.post("/generate", response_model=UnitAllotmentGenerateResponse)
 async def generate_unit_allotments(
     request: UnitAllotmentGenerateRequest,
@@ -53,7 +61,7 @@ async def generate_unit_allotments(
         current_date = date.today()
         
         # Initialize services
-        calculator = UnitCalculationEngine()
+        calculator = default_engine
         excel_generator = UnitAllotmentExcelGenerator()
         
         # Calculate drawdown quarter from current date
@@ -100,7 +108,7 @@ async def generate_unit_allotments(
             ).all()
             
             if existing_allotments:
-                s3_storage = S3DocumentStorage()
+                s3_storage = get_s3_storage()
                 deleted_files = 0
                 
                 # Delete all Excel files from S3 for this quarter
@@ -129,18 +137,43 @@ async def generate_unit_allotments(
         total_units_allocated = 0
         total_amount_allocated = Decimal('0')
         
-        for drawdown in paid_drawdowns:
+        # Calculate all values for every drawdown at once; the fund-level inputs are shared
+        try:
+            batch_calculations = calculator.calculate_all_batch(
+                [
+                    (drawdown.drawdown_amount, drawdown.lp.commitment_amount, drawdown.drawdown_due_date)
+                    for drawdown in paid_drawdowns
+                ],
+                nav_value=fund.nav,
+                mgmt_fee_rate=fund.mgmt_fee_rate,
+                stamp_duty_rate=fund.stamp_duty_rate
+            )
+        except ValueError as e:
+            # Re-run the failed batch per LP so the error names the LP whose inputs were rejected
+            for drawdown in paid_drawdowns:
+                try:
+                    calculator.calculate_all_for_drawdown(
+                        drawdown_amount=drawdown.drawdown_amount,
+                        nav_value=fund.nav,
+                        commitment_amount=drawdown.lp.commitment_amount,
+                        mgmt_fee_rate=fund.mgmt_fee_rate,
+                        stamp_duty_rate=fund.stamp_duty_rate,
+                        drawdown_date=drawdown.drawdown_due_date
+                    )
+                except Exception as lp_error:
+                    logger.error(f"Error calculating allotment for LP {drawdown.lp.lp_name}: {lp_error}")
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Error calculating allotment for LP {drawdown.lp.lp_name}: {str(lp_error)}"
+                    )
+            logger.error(f"Error calculating allotments for fund {request.fund_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error calculating allotments: {str(e)}"
+            )
+        
+        for drawdown, calculations in zip(paid_drawdowns, batch_calculations):
             try:
-                # Calculate all values for this drawdown
-                calculations = calculator.calculate_all_for_drawdown(
-                    drawdown_amount=drawdown.drawdown_amount,
-                    nav_value=fund.nav,
-                    commitment_amount=drawdown.lp.commitment_amount,
-                    mgmt_fee_rate=fund.mgmt_fee_rate,
-                    stamp_duty_rate=fund.stamp_duty_rate,
-                    drawdown_date=drawdown.drawdown_due_date
-                )
-                
                 # Note: For force recalculation, cleanup is already handled at quarter level above
                 
                 # Create new allotment record
@@ -192,17 +225,22 @@ async def generate_unit_allotments(
         )
         db.commit()
         
-        # Refresh objects to get IDs
-        for allotment in allotments_created:
-            db.refresh(allotment)
+        # Every commit expires the allotments, so reload them with one query before each
+        # read instead of letting each allotment lazy-load on its own
+        allotment_ids = [inspect(allotment).identity[0] for allotment in allotments_created]
+        allotments_created = _load_allotments(db, allotment_ids)
         
         # Generate Excel sheet
         try:
-            excel_url = excel_generator.generate_allotment_sheet(
+            # Rows are validated in the same pass that writes them to the sheet
+            report = excel_generator.generate_allotment_sheet_with_report(
                 allotments=allotments_created,
                 fund_name=fund.scheme_name,
                 drawdown_quarter=drawdown_quarter
             )
+            excel_url = report['s3_url']
+            if report['validation_errors']:
+                logger.warning(f"Unit allotment validation issues for fund {request.fund_id} quarter {drawdown_quarter}: {report['validation_errors']}")
             
             # Update allotments with Excel file URL
             for allotment in allotments_created:
@@ -234,7 +272,7 @@ async def generate_unit_allotments(
         
         # Convert to response models
         allotment_responses = [
-            UnitAllotmentResponse.model_validate(allotment) for allotment in allotments_created
+            UnitAllotmentResponse.model_validate(allotment) for allotment in _load_allotments(db, allotment_ids)
         ]
         
         return UnitAllotmentGenerateResponse(
@@ -410,7 +448,7 @@ async def delete_unit_allotment(
         # Delete Excel file from S3 if exists
         if excel_url:
             try:
-                s3_storage = S3DocumentStorage()
+                s3_storage = get_s3_storage()
                 # Extract S3 key from URL
                 s3_key = extract_s3_key_from_url(excel_url, s3_storage.bucket_name, s3_storage.region_name)
                 s3_storage.delete_object(s3_key)
@@ -0,0 +1,40 @@
+"""
+Shared base classes for API schemas
+"""
+from typing import Any, Generic, Iterable, List, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+T = TypeVar("T")
+
+# Rows loaded by our own queries already satisfy DB constraints, so list endpoints
+# build their response items without re-validation. Tests can set this to False
+# to run full validation on every row.
+TRUST_ORM = True
+
+
+class ORMBase(BaseModel):
+    """Base for response schemas hydrated from SQLAlchemy rows"""
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True, extra='ignore')
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """Build from a trusted ORM row, skipping validation unless TRUST_ORM is off"""
+        if not TRUST_ORM:
+            return cls.model_validate(obj)
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+
+
+class ListResponse(BaseModel, Generic[T]):
+    """Paginated list envelope; each parametrization is built once and cached by pydantic"""
+    data: List[T]
+    total: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_list(cls, rows: Iterable[Any], total: int):
+        item_type = cls.__pydantic_generic_metadata__["args"][0]
+        if TRUST_ORM and issubclass(item_type, ORMBase):
+            return cls.model_construct(data=[item_type.from_orm_fast(row) for row in rows], total=total)
+        return cls.model_validate({"data": rows, "total": total}, from_attributes=True)
@@ -0,0 +1,68 @@
+"""
+Shared annotated field types for API schemas
+"""
+import re
+from decimal import Decimal
+from typing import Literal
+from typing_extensions import Annotated
+
+from pydantic import AfterValidator, Field, PlainSerializer, Strict
+
+# Monetary amounts read back from Numeric(15, 2) columns are already quantized,
+# so they can be emitted as plain fixed-point strings without re-normalizing.
+Money = Annotated[
+    Decimal,
+    PlainSerializer(lambda d: format(d, 'f'), return_type=str, when_used='json'),
+]
+
+# Request-side amounts with two decimal places
+Decimal2 = Annotated[Decimal, Field(max_digits=18, decimal_places=2)]
+
+# Amounts hydrated from Numeric/DECIMAL columns already arrive as Decimal instances;
+# strict mode accepts them as-is instead of going through the coercion branch.
+# Only for fields that never come from request bodies, where JSON floats must still parse.
+NumericDecimal = Annotated[Decimal, Strict()]
+
+# Closed sets of status values, checked by pydantic-core instead of Python validators
+PaymentStatus = Literal['Pending', 'Paid', 'Shortfall', 'Over-payment']
+DrawdownStatus = Literal[
+    'Drawdown Payment Pending',
+    'Allotment Sheet Generation Pending',
+    'Allotment Pending',
+    'Allotment Done',
+]
+KYCStatus = Literal['Pending', 'Done']
+
+# Identifier formats, compiled once per process
+_PAN_RE = re.compile(r"[A-Z0-9]{10}")
+_IFSC_RE = re.compile(r"[A-Z]{4}0[A-Z0-9]{6}")
+_DIN_RE = re.compile(r"\d{8}")
+
+
+def _validate_pan(v: str) -> str:
+    if not v:
+        return v
+    v = v.upper()
+    if not _PAN_RE.fullmatch(v):
+        raise ValueError('PAN must be exactly 10 alphanumeric characters')
+    return v
+
+
+def _validate_ifsc(v: str) -> str:
+    if not v:
+        return v
+    v = v.upper()
+    if not _IFSC_RE.fullmatch(v):
+        raise ValueError('IFSC must be 11 characters: 4 letters, 0, then 6 alphanumerics')
+    return v
+
+
+def _validate_din(v: str) -> str:
+    if v and not _DIN_RE.fullmatch(v):
+        raise ValueError('DIN must be exactly 8 digits')
+    return v
+
+
+PAN = Annotated[str, AfterValidator(_validate_pan)]
+IFSC = Annotated[str, AfterValidator(_validate_ifsc)]
+DIN = Annotated[str, AfterValidator(_validate_din)]
@@ -1,12 +1,17 @@
 """
 Pydantic schemas for Drawdown operations
 """
-from pydantic import BaseModel, ConfigDict, Field
+from dataclasses import dataclass
+from pydantic import BaseModel, Field
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, List
+from typing_extensions import TypedDict
 from uuid import UUID
 
+from ._base import ORMBase
+from ._types import DrawdownStatus, Money
+
 # Input schemas for API requests
 class DrawdownGenerateRequest(BaseModel):
     """Request schema for generating drawdowns"""
@@ -26,7 +31,7 @@ class DrawdownPreviewRequest(BaseModel):
 
 class DrawdownStatusUpdateRequest(BaseModel):
     """Request schema for updating drawdown status"""
-    new_status: str = Field(..., description="New status for the drawdown")
+    new_status: DrawdownStatus = Field(..., description="New status for the drawdown")
     notes: Optional[str] = Field(None, description="Optional notes for the status change")
 
 class DrawdownUpdateRequest(BaseModel):
@@ -53,17 +58,15 @@ class DrawdownUpdateRequest(BaseModel):
     forecast_next_quarter_period: Optional[str] = Field(None, description="Forecast quarter period")
     
     # Status and other fields
-    status: Optional[str] = Field(None, description="Drawdown status")
+    status: Optional[DrawdownStatus] = Field(None, description="Drawdown status")
     drawdown_quarter: Optional[str] = Field(None, description="Drawdown quarter")
     allotted_units: Optional[int] = Field(None, ge=0, description="Units allotted")
     reference_number: Optional[str] = Field(None, description="Reference number")
     notes: Optional[str] = Field(None, description="Notes")
 
 # Response schemas
-class LPDrawdownResponse(BaseModel):
+class LPDrawdownResponse(ORMBase):
     """Response schema for individual LP drawdown"""
-    model_config = ConfigDict(from_attributes=True)
-    
     drawdown_id: UUID
     fund_id: int
     lp_id: UUID
@@ -73,10 +76,10 @@ class LPDrawdownResponse(BaseModel):
     drawdown_quarter: str
     
     # Calculated amounts
-    committed_amt: Decimal
-    drawdown_amount: Decimal
-    amount_called_up: Decimal
-    remaining_commitment: Decimal
+    committed_amt: Money
+    drawdown_amount: Money
+    amount_called_up: Money
+    remaining_commitment: Money
     
     # Forecast information
     forecast_next_quarter: Decimal
@@ -87,27 +90,25 @@ class LPDrawdownResponse(BaseModel):
     
     # Optional fields
     payment_received_date: Optional[date] = None
-    amt_accepted: Optional[Decimal] = None
+    amt_accepted: Optional[Money] = None
     allotted_units: Optional[int] = None
     nav_value: Optional[Decimal] = None
     date_of_allotment: Optional[date] = None
-    mgmt_fees: Optional[Decimal] = None
-    stamp_duty: Optional[Decimal] = None
+    mgmt_fees: Optional[Money] = None
+    stamp_duty: Optional[Money] = None
     reference_number: Optional[str] = None
     notes: Optional[str] = None
     
     created_at: datetime
     updated_at: datetime
 
-class DrawdownNoticeResponse(BaseModel):
+class DrawdownNoticeResponse(ORMBase):
     """Response schema for drawdown notice"""
-    model_config = ConfigDict(from_attributes=True)
-    
     notice_id: UUID
     drawdown_id: UUID
     lp_id: UUID
     notice_date: date
-    amount_due: Decimal
+    amount_due: Money
     due_date: date
     pdf_file_path: Optional[str] = None
     document_id: Optional[UUID] = None
@@ -121,17 +122,29 @@ class LPDrawdownPreview(BaseModel):
     """Preview schema for individual LP drawdown"""
     lp_id: UUID
     lp_name: str
-    commitment_amount: Decimal
-    drawdown_amount: Decimal
-    amount_called_up: Decimal
-    remaining_commitment: Decimal
+    commitment_amount: Money
+    drawdown_amount: Money
+    amount_called_up: Money
+    remaining_commitment: Money
+
+class DrawdownSummaryTD(TypedDict):
+    """Aggregate figures returned with a drawdown preview"""
+    total_lps: int
+    total_amount: float
+    average_drawdown: float
+
+class StatusHistoryEntry(TypedDict):
+    """Single status transition of a drawdown"""
+    status: str
+    changed_at: datetime
+    notes: Optional[str]
 
 class DrawdownPreviewResponse(BaseModel):
     """Response schema for drawdown preview"""
     preview_id: str
-    total_drawdown_amount: Decimal
+    total_drawdown_amount: Money
     lp_previews: List[LPDrawdownPreview]
-    summary: dict
+    summary: DrawdownSummaryTD
     sample_html_preview: Optional[str] = Field(None, description="HTML preview of capital call notice for first LP")
 
 class DrawdownGenerateResponse(BaseModel):
@@ -141,14 +154,13 @@ class DrawdownGenerateResponse(BaseModel):
     drawdown_count: int
     fund_id: int
     drawdown_quarter: str
-    total_amount: Decimal
+    total_amount: Money
     generated_pdfs: List[str] = Field(description="List of paths to generated PDF files")
     drawdowns: List[LPDrawdownResponse]
 
-class DrawdownWithBankDetails(BaseModel):
-    """Extended drawdown response with fund bank details for PDF generation"""
-    model_config = ConfigDict(from_attributes=True)
-    
+@dataclass(slots=True)
+class DrawdownWithBankDetails:
+    """Extended drawdown record with fund bank details for PDF generation"""
     # Core drawdown fields
     drawdown_id: UUID
     lp_id: UUID
@@ -163,15 +175,59 @@ class DrawdownWithBankDetails(BaseModel):
     status: str
     
     # LP details
-    investor: str = Field(alias="lp_name")
+    investor: str
     
     # Fund bank details
     bank_name: str
-    ifsc: str = Field(alias="bank_ifsc")
-    acct_name: str = Field(alias="bank_account_name")
-    acct_number: str = Field(alias="bank_account_no")
-    bank_contact: str = Field(alias="bank_contact_person")
-    phone: str = Field(alias="bank_contact_phone")
+    ifsc: str
+    acct_name: str
+    acct_number: str
+    bank_contact: str
+    phone: str
+
+    @classmethod
+    def from_rows(cls, drawdown, lp, fund) -> "DrawdownWithBankDetails":
+        """Build from LPDrawdown, LPDetails and FundDetails rows"""
+        return cls(
+            drawdown_id=drawdown.drawdown_id,
+            lp_id=drawdown.lp_id,
+            notice_date=drawdown.notice_date,
+            drawdown_due_date=drawdown.drawdown_due_date,
+            drawdown_amount=drawdown.drawdown_amount,
+            committed_amt=drawdown.committed_amt,
+            amount_called_up=drawdown.amount_called_up,
+            remaining_commitment=drawdown.remaining_commitment,
+            forecast_next_quarter=drawdown.forecast_next_quarter,
+            forecast_next_quarter_period=drawdown.forecast_next_quarter_period,
+            status=drawdown.status,
+            investor=lp.lp_name,
+            bank_name=fund.bank_name,
+            ifsc=fund.bank_ifsc,
+            acct_name=fund.bank_account_name,
+            acct_number=fund.bank_account_no,
+            bank_contact=fund.bank_contact_person,
+            phone=fund.bank_contact_phone,
+        )
+
+    def to_pdf_data(self) -> dict:
+        """Flatten into the field mapping expected by the capital call generators"""
+        return {
+            'notice_date': self.notice_date.isoformat(),
+            'investor': self.investor,
+            'amount_due': float(self.drawdown_amount),
+            'total_commitment': float(self.committed_amt),
+            'amount_called_up': float(self.amount_called_up),
+            'remaining_commitment': float(self.remaining_commitment),
+            'contribution_due_date': self.drawdown_due_date.isoformat(),
+            'bank_name': self.bank_name,
+            'ifsc': self.ifsc,
+            'acct_name': self.acct_name,
+            'acct_number': self.acct_number,
+            'bank_contact': self.bank_contact,
+            'phone': self.phone,
+            'forecast_next_quarter': float(self.forecast_next_quarter),
+            'forecast_next_quarter_period': self.forecast_next_quarter_period
+        }
 
 class DrawdownListResponse(BaseModel):
     """Response schema for listing drawdowns"""
@@ -183,15 +239,15 @@ class DrawdownListResponse(BaseModel):
 class DrawdownStatusHistoryResponse(BaseModel):
     """Response schema for drawdown status history"""
     drawdown_id: UUID
-    status_history: List[dict]
+    status_history: List[StatusHistoryEntry]
 
 class DrawdownSummaryResponse(BaseModel):
     """Response schema for drawdown summary statistics"""
     fund_id: int
     quarter: str
     total_lps: int
-    total_amount: Decimal
+    total_amount: Money
     total_sent: int
     total_received: int
     total_pending: int
-    avg_drawdown_amount: Decimal
\ No newline at end of file
+    avg_drawdown_amount: Decimal
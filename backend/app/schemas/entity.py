@@ -1,8 +1,11 @@
-from pydantic import BaseModel, ConfigDict, validator, model_validator
+from pydantic import BaseModel, model_validator
 from typing import Optional, List
 from datetime import date, datetime
 from enum import Enum
 
+from ._base import ORMBase
+from ._types import PAN
+
 class EntityType(str, Enum):
     MANAGER = "Manager"
     SPONSOR = "Sponsor"
@@ -18,6 +21,8 @@ class EntityType(str, Enum):
     TAX = "Tax"
 
 class EntityBase(BaseModel):
+    # PAN format is only enforced on input (EntityCreate/EntityUpdate), so rows stored
+    # under older, looser checks can still be read back through EntityResponse
     entity_type: EntityType
     entity_pan: str
     entity_name: str
@@ -33,18 +38,6 @@ class EntityBase(BaseModel):
     entity_poc_din: Optional[str] = None
     entity_poc_pan: Optional[str] = None
 
-    @validator('entity_pan')
-    def validate_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('PAN must be exactly 10 characters')
-        return v.upper() if v else v
-
-    @validator('entity_poc_pan')
-    def validate_poc_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('POC PAN must be exactly 10 characters')
-        return v.upper() if v else v
-
     @model_validator(mode='after')
     def validate_entity_requirements(self):
         entity_type = self.entity_type
@@ -79,12 +72,13 @@ class EntityBase(BaseModel):
         return self
 
 class EntityCreate(EntityBase):
-    pass
+    entity_pan: PAN
+    entity_poc_pan: Optional[PAN] = None
 
 class EntityUpdate(BaseModel):
     entity_type: Optional[EntityType] = None
     entity_name: Optional[str] = None
-    entity_pan: Optional[str] = None
+    entity_pan: Optional[PAN] = None
     entity_address: Optional[str] = None
     entity_telephone: Optional[str] = None
     entity_email: Optional[str] = None
@@ -94,37 +88,19 @@ class EntityUpdate(BaseModel):
     entity_date_of_incorporation: Optional[date] = None
     entity_gst_number: Optional[str] = None
     entity_poc_din: Optional[str] = None
-    entity_poc_pan: Optional[str] = None
-
-    @validator('entity_pan')
-    def validate_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('PAN must be exactly 10 characters')
-        return v.upper() if v else v
+    entity_poc_pan: Optional[PAN] = None
 
-    @validator('entity_poc_pan')
-    def validate_poc_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('POC PAN must be exactly 10 characters')
-        return v.upper() if v else v
-
-class EntityResponse(EntityBase):
+class EntityResponse(EntityBase, ORMBase):
     entity_id: int
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
-class EntitySearch(BaseModel):
+class EntitySearch(ORMBase):
     entity_id: int
     entity_name: Optional[str] = None
     entity_type: EntityType
 
-    model_config = ConfigDict(from_attributes=True) 
-
 # Paginated response schema for GET all entities
-class EntityListResponse(BaseModel):
+class EntityListResponse(ORMBase):
     data: List[EntityResponse]
     total: int
-    
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
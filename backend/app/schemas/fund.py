@@ -1,8 +1,12 @@
-from pydantic import BaseModel, ConfigDict, validator
+from pydantic import BaseModel
 from typing import Optional, List
+from typing_extensions import TypedDict
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+
+from ._base import ORMBase
+from ._types import DIN, IFSC, PAN
 from .entity import EntityResponse
 
 class SchemeStatus(str, Enum):
@@ -24,6 +28,8 @@ class CategorySubcategory(str, Enum):
     CATEGORY_III_AIF = "Category III AIF"
 
 class FundBase(BaseModel):
+    # Identifier formats are only enforced on input (FundCreate/FundUpdate), so rows
+    # stored under older, looser checks can still be read back through FundResponse
     # Core fund details - all compulsory
     scheme_name: str
     scheme_status: SchemeStatus
@@ -78,39 +84,26 @@ class FundBase(BaseModel):
     extended_end_date: Optional[date] = None
     greenshoe_option: Optional[Decimal] = None
 
-    @validator('aif_pan', 'entity_pan', 'investment_officer_pan', 'scheme_pan')
-    def validate_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('PAN must be exactly 10 characters')
-        return v.upper() if v else v
-
-    @validator('bank_ifsc')
-    def validate_ifsc(cls, v):
-        if v and len(v) != 11:
-            raise ValueError('IFSC must be exactly 11 characters')
-        return v.upper() if v else v
-
-    @validator('investment_officer_din')
-    def validate_din(cls, v):
-        if v and len(v) != 8:
-            raise ValueError('DIN must be exactly 8 characters')
-        return v
-
 class FundCreate(FundBase):
-    pass
+    aif_pan: PAN
+    investment_officer_pan: PAN
+    investment_officer_din: DIN
+    scheme_pan: PAN
+    bank_ifsc: IFSC
+    entity_pan: Optional[PAN] = None
 
 class FundUpdate(BaseModel):
     scheme_name: Optional[str] = None
     scheme_status: Optional[SchemeStatus] = None
     aif_name: Optional[str] = None
-    aif_pan: Optional[str] = None
+    aif_pan: Optional[PAN] = None
     aif_registration_no: Optional[str] = None
     legal_structure: Optional[LegalStructure] = None
     category_subcategory: Optional[CategorySubcategory] = None
     scheme_structure_type: Optional[SchemeStructure] = None
     entity_type: Optional[str] = None
     entity_name: Optional[str] = None
-    entity_pan: Optional[str] = None
+    entity_pan: Optional[PAN] = None
     entity_email: Optional[str] = None
     entity_address: Optional[str] = None
     custodian_name: Optional[str] = None
@@ -120,10 +113,10 @@ class FundUpdate(BaseModel):
     compliance_officer_phone: Optional[str] = None
     investment_officer_name: Optional[str] = None
     investment_officer_designation: Optional[str] = None
-    investment_officer_pan: Optional[str] = None
-    investment_officer_din: Optional[str] = None
+    investment_officer_pan: Optional[PAN] = None
+    investment_officer_din: Optional[DIN] = None
     date_of_appointment: Optional[date] = None
-    scheme_pan: Optional[str] = None
+    scheme_pan: Optional[PAN] = None
     date_final_draft_ppm: Optional[date] = None
     date_sebi_ppm_comm: Optional[date] = None
     date_launch_of_scheme: Optional[date] = None
@@ -134,7 +127,7 @@ class FundUpdate(BaseModel):
     extension_permitted: Optional[bool] = None
     extended_end_date: Optional[date] = None
     bank_name: Optional[str] = None
-    bank_ifsc: Optional[str] = None
+    bank_ifsc: Optional[IFSC] = None
     bank_account_name: Optional[str] = None
     bank_account_no: Optional[str] = None
     bank_contact_person: Optional[str] = None
@@ -143,48 +136,40 @@ class FundUpdate(BaseModel):
     target_fund_size: Optional[Decimal] = None
     greenshoe_option: Optional[Decimal] = None
 
-    @validator('aif_pan', 'entity_pan', 'investment_officer_pan', 'scheme_pan')
-    def validate_pan(cls, v):
-        if v and len(v) != 10:
-            raise ValueError('PAN must be exactly 10 characters')
-        return v.upper() if v else v
-
-    @validator('bank_ifsc')
-    def validate_ifsc(cls, v):
-        if v and len(v) != 11:
-            raise ValueError('IFSC must be exactly 11 characters')
-        return v.upper() if v else v
-
-    @validator('investment_officer_din')
-    def validate_din(cls, v):
-        if v and len(v) != 8:
-            raise ValueError('DIN must be exactly 8 characters')
-        return v
-
-class FundResponse(FundBase):
+class FundResponse(FundBase, ORMBase):
     fund_id: int
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
-class FundSearch(BaseModel):
+class FundSearch(ORMBase):
     fund_id: int
     scheme_name: str
 
-    model_config = ConfigDict(from_attributes=True)
-
-class FundDetailsSummary(BaseModel):
+class SchemeDetailsTD(TypedDict):
+    """Scheme section of the fund details summary"""
+    name: str
+    status: str
+    pan: str
+    date_of_filing_final_draft_ppm_with_sebi: Optional[str]
+    date_of_sebi_communication_for_taking_ppm_on_record: Optional[str]
+    date_of_launch_of_scheme: Optional[str]
+    date_of_initial_close: Optional[str]
+    date_of_final_close: Optional[str]
+    total_commitment_received_corpus_initial_close_rs_cr: Optional[float]
+    target_fund_size: Optional[float]
+    greenshoe_option: Optional[float]
+    end_date_of_terms_of_scheme: Optional[str]
+    extension_of_term_permitted_as_per_fund_documents: Optional[str]
+
+class FundDetailsSummary(ORMBase):
     """Comprehensive fund information for reporting"""
     fund_id: int
-    scheme_details: dict
+    scheme_details: SchemeDetailsTD
     aif_details: dict
     financial_info: dict
     important_dates: dict
     bank_details: dict
 
-    model_config = ConfigDict(from_attributes=True)
-
 class FundEntityBase(BaseModel):
     fund_id: int
     entity_id: int
@@ -193,10 +178,8 @@ class FundEntityBase(BaseModel):
 class FundEntityCreate(FundEntityBase):
     pass
 
-class FundEntityResponse(FundEntityBase):
+class FundEntityResponse(FundEntityBase, ORMBase):
     fund_entity_id: int
     entity_details: Optional[EntityResponse] = None
     created_at: datetime
     updated_at: datetime
-
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
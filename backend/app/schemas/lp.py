@@ -1,9 +1,31 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import date, datetime
 from uuid import UUID
 from enum import Enum
-from pydantic import ConfigDict
+
+from ._base import ORMBase
+from ._types import KYCStatus, PaymentStatus
+
+__all__ = [
+    "LPStatus",
+    "LPDetailsBase",
+    "LPDetailsCreate",
+    "LPDetailsUpdate",
+    "LPDetailsResponse",
+    "LPDocumentBase",
+    "LPDocumentCreate",
+    "LPDocumentResponse",
+    "LPStatusUpdate",
+    "LPStatusResponse",
+    "LPDrawdownBase",
+    "LPDrawdownCreate",
+    "LPDrawdownUpdate",
+    "LPDrawdownResponse",
+    "LPWithDrawdowns",
+    "DocumentUploadRequest",
+    "LPListResponse",
+]
 
 # LP Details Schemas
 
@@ -17,7 +39,7 @@ class LPDetailsBase(BaseModel):
     fund_id: Optional[int] = None  # Added fund reference
     lp_name: str
     mobile_no: Optional[str] = None
-    email: EmailStr
+    email: str  # Validated as EmailStr on create/update only; stored rows are trusted
     email_for_drawdowns: Optional[str] = None  # New field from UC-LP-4
     address: Optional[str] = None
     nominee: Optional[str] = None
@@ -40,23 +62,21 @@ class LPDetailsBase(BaseModel):
     status: Optional[str] = "Waiting for KYC"  # Default status
 
 class LPDetailsCreate(LPDetailsBase):
-    pass
+    email: EmailStr
 
 class LPDetailsUpdate(LPDetailsBase):
     fund_id: Optional[int] = None  # Explicitly added for updates
     lp_name: Optional[str] = None
     email: Optional[EmailStr] = None
     email_for_drawdowns: Optional[str] = None
-    kyc_status: Optional[str] = None
-    status: Optional[str] = None
+    kyc_status: Optional[KYCStatus] = None
+    status: Optional[LPStatus] = None
 
-class LPDetailsResponse(LPDetailsBase):
+class LPDetailsResponse(LPDetailsBase, ORMBase):
     lp_id: UUID
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # LP Document Schemas
 class LPDocumentBase(BaseModel):
     lp_id: UUID
@@ -66,17 +86,15 @@ class LPDocumentBase(BaseModel):
 class LPDocumentCreate(LPDocumentBase):
     pass
 
-class LPDocumentResponse(LPDocumentBase):
+class LPDocumentResponse(LPDocumentBase, ORMBase):
     lp_document_id: UUID
     created_at: datetime
     document_details: Optional[dict] = None  # Will include document metadata
 
-    model_config = ConfigDict(from_attributes=True)
-
 # LP Status Schema
 class LPStatusUpdate(BaseModel):
     status: LPStatus
-    kyc_status: Optional[str] = None
+    kyc_status: Optional[KYCStatus] = None
 
 class LPStatusResponse(BaseModel):
     lp_id: UUID
@@ -93,7 +111,7 @@ class LPDrawdownBase(BaseModel):
     drawdown_percentage: Optional[float] = Field(None, ge=0, le=100, description="Percentage between 0-100")
     payment_due_date: date
     payment_received_date: Optional[date] = None
-    payment_status: str = "Pending"
+    payment_status: PaymentStatus = "Pending"
     reference_number: Optional[str] = None
     notes: Optional[str] = None
     fund_id: Optional[int] = None
@@ -107,24 +125,20 @@ class LPDrawdownUpdate(BaseModel):
     drawdown_percentage: Optional[float] = Field(None, ge=0, le=100, description="Percentage between 0-100")
     payment_due_date: Optional[date] = None
     payment_received_date: Optional[date] = None
-    payment_status: Optional[str] = None
+    payment_status: Optional[PaymentStatus] = None
     reference_number: Optional[str] = None
     notes: Optional[str] = None
     fund_id: Optional[int] = None
 
-class LPDrawdownResponse(LPDrawdownBase):
+class LPDrawdownResponse(LPDrawdownBase, ORMBase):
     drawdown_id: UUID
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Combined schemas
 class LPWithDrawdowns(LPDetailsResponse):
     drawdowns: List[LPDrawdownResponse] = []
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Document upload schema for API
 class DocumentUploadRequest(BaseModel):
     document_type: str  # KYC, CA, CML
@@ -132,8 +146,6 @@ class DocumentUploadRequest(BaseModel):
     share_with_emails: Optional[List[str]] = None
 
 # Paginated response schema for GET all LPs
-class LPListResponse(BaseModel):
+class LPListResponse(ORMBase):
     data: List[LPDetailsResponse]
     total: int
-    
-    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 
+from ._base import ORMBase
+from ._types import Decimal2, Money, PaymentStatus
+
 # Request schemas
 class PaymentReconciliationUploadRequest(BaseModel):
     fund_id: int
@@ -11,49 +14,38 @@ class ManualPaymentRecordRequest(BaseModel):
     lp_id: str
     fund_id: int
     drawdown_quarter: str
-    paid_amount: Decimal = Field(..., decimal_places=2)
+    paid_amount: Decimal2
     payment_date: date
     notes: Optional[str] = None
 
 class PaymentReconciliationUpdateRequest(BaseModel):
-    paid_amount: Optional[Decimal] = Field(None, decimal_places=2)
+    paid_amount: Optional[Decimal2] = None
     payment_date: Optional[date] = None
-    status: Optional[str] = None
+    status: Optional[PaymentStatus] = None
     notes: Optional[str] = None
 
-    @validator('status')
-    def validate_status(cls, v):
-        if v is not None:
-            valid_statuses = ['Pending', 'Paid', 'Shortfall', 'Over-payment']
-            if v not in valid_statuses:
-                raise ValueError(f'Status must be one of: {", ".join(valid_statuses)}')
-        return v
-
 # Response schemas
-class LPPaymentResponse(BaseModel):
+class LPPaymentResponse(ORMBase):
     lp_payment_id: int
     lp_id: str
     lp_name: str
     drawdown_id: str
     payment_id: Optional[int] = None
     payment_s3_link: Optional[str] = None
-    paid_amount: Decimal
+    paid_amount: Money
     payment_date: date
     fund_id: int
     quarter: str
-    amount_due: Decimal
+    amount_due: Money
     status: str
     notes: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 class LPPaymentSummary(BaseModel):
     lp_id: str
     lp_name: str
-    expected: Decimal
-    received: Decimal
+    expected: Money
+    received: Money
     status: str
     drawdown_status_updated: bool
 
@@ -70,8 +62,8 @@ class PaymentReconciliationUploadResponse(BaseModel):
     payment_id: int
     fund_id: int
     drawdown_quarter: str
-    total_expected: Decimal
-    total_received: Decimal
+    total_expected: Money
+    total_received: Money
     overall_status: str
     processed_payments: int
     matched_payments: int
@@ -106,4 +98,4 @@ class LLMPaymentExtraction(BaseModel):
     quarter: str
 
 class LLMProcessingResult(BaseModel):
-    results: List[LLMPaymentExtraction] 
\ No newline at end of file
+    results: List[LLMPaymentExtraction]
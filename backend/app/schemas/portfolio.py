@@ -1,10 +1,14 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from dataclasses import dataclass
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
 from pydantic import ConfigDict
 
+from ._base import ListResponse, ORMBase
+from ._types import NumericDecimal
+
 # Portfolio Company Schemas
 
 class PortfolioCompanyBase(BaseModel):
@@ -30,14 +34,11 @@ class PortfolioCompanyUpdate(BaseModel):
     pan: Optional[str] = None
     isin: Optional[str] = None
 
-class PortfolioCompanyResponse(PortfolioCompanyBase):
+class PortfolioCompanyResponse(PortfolioCompanyBase, ORMBase):
     company_id: int
-    company_name: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Portfolio Founder Schemas
 
 class PortfolioFounderBase(BaseModel):
@@ -53,15 +54,12 @@ class PortfolioFounderUpdate(BaseModel):
     founder_email: Optional[str] = None
     founder_role: Optional[str] = None
 
-class PortfolioFounderResponse(PortfolioFounderBase):
+class PortfolioFounderResponse(PortfolioFounderBase, ORMBase):
     founder_id: int
     company_id: int
-    founder_name: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Portfolio Investment Schemas
 
 class PortfolioInvestmentBase(BaseModel):
@@ -89,14 +87,14 @@ class PortfolioInvestmentUpdate(BaseModel):
     valuation_date: Optional[date] = None
     ec_sign_date: Optional[date] = None
 
-class PortfolioInvestmentResponse(PortfolioInvestmentBase):
+class PortfolioInvestmentResponse(PortfolioInvestmentBase, ORMBase):
     investment_id: int
     company_id: int
+    amount_invested: NumericDecimal
+    latest_valuation: Optional[NumericDecimal] = None
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Portfolio Document Schemas
 
 class PortfolioDocumentBase(BaseModel):
@@ -111,14 +109,12 @@ class PortfolioDocumentUpdate(BaseModel):
     document_type: Optional[str] = None
     doc_link: Optional[str] = None
 
-class PortfolioDocumentResponse(PortfolioDocumentBase):
+class PortfolioDocumentResponse(PortfolioDocumentBase, ORMBase):
     portfolio_document_id: int
     company_id: int
     document_id: UUID
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 # Portfolio Onboarding Input Schema (UI Fields Only)
 
 class FounderInfo(BaseModel):
@@ -184,7 +180,8 @@ class PortfolioOnboardingInput(BaseModel):
     )
 
 # SHA Extracted Data Schema (for internal processing)
-class SHAExtractedData(BaseModel):
+@dataclass(slots=True)
+class SHAExtractedData:
     """Data extracted from SHA document (internal use only)"""
     execution_date: Optional[str] = None  # Will map to sha_sign_date
     company_name: Optional[str] = None
@@ -200,26 +197,7 @@ class PortfolioOnboardResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 # List Response with pagination
-class PortfolioCompanyListResponse(BaseModel):
-    data: List[PortfolioCompanyResponse]
-    total: int
-
-    model_config = ConfigDict(from_attributes=True)
-
-class PortfolioFounderListResponse(BaseModel):
-    data: List[PortfolioFounderResponse]
-    total: int
-
-    model_config = ConfigDict(from_attributes=True)
-
-class PortfolioInvestmentListResponse(BaseModel):
-    data: List[PortfolioInvestmentResponse]
-    total: int
-
-    model_config = ConfigDict(from_attributes=True)
-
-class PortfolioDocumentListResponse(BaseModel):
-    data: List[PortfolioDocumentResponse]
-    total: int
-
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+PortfolioCompanyListResponse = ListResponse[PortfolioCompanyResponse]
+PortfolioFounderListResponse = ListResponse[PortfolioFounderResponse]
+PortfolioInvestmentListResponse = ListResponse[PortfolioInvestmentResponse]
+PortfolioDocumentListResponse = ListResponse[PortfolioDocumentResponse]
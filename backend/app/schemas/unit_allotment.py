@@ -1,9 +1,10 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from decimal import Decimal
 from datetime import date, datetime
 import uuid
 
+from ._types import NumericDecimal
+
 class UnitAllotmentBase(BaseModel):
     """Base schema for unit allotment with common fields"""
     clid: Optional[str] = None
@@ -30,15 +31,15 @@ class UnitAllotmentCalculated(UnitAllotmentBase):
     drawdown_id: uuid.UUID
     lp_id: uuid.UUID
     fund_id: int
-    mgmt_fees: Decimal
-    committed_amt: Decimal
-    amt_accepted: Decimal
-    drawdown_amount: Decimal
+    mgmt_fees: NumericDecimal
+    committed_amt: NumericDecimal
+    amt_accepted: NumericDecimal
+    drawdown_amount: NumericDecimal
     drawdown_date: date
     drawdown_quarter: str
     nav_value: int  # NAV as integer
     allotted_units: int
-    stamp_duty: Decimal
+    stamp_duty: NumericDecimal
     status: str = "Generated"
 
 class UnitAllotmentResponse(UnitAllotmentCalculated):
@@ -63,7 +64,7 @@ class UnitAllotmentGenerateResponse(BaseModel):
     excel_file_url: Optional[str] = None
     total_lps: int
     total_units_allocated: int
-    total_amount_allocated: Decimal
+    total_amount_allocated: NumericDecimal
 
 class UnitAllotmentListResponse(BaseModel):
     """Schema for paginated unit allotment list"""
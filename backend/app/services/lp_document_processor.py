@@ -4,25 +4,26 @@ Handles document upload, text extraction, and data population
 """
 
 import os
-import json
+import re
 import uuid
-from typing import Dict, Any, Optional, List, Tuple
+from functools import lru_cache
+from datetime import date
+from typing import Dict, Any, Optional, List, Tuple, Union
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException
+from pydantic_core import from_json
 
 from ..models.document import Document
 from ..models.lp_document import LPDocument
 from ..models.lp_details import LPDetails
 from ..utils.google_clients_gcp import drive_file_dump
 from ..utils.pdf_extractor import extract_text_from_specific_pages, extract_text_from_pdf
-from ..utils.llm import get_response_from_openai
+from ..utils.llm import get_response_from_openai, aget_response_from_openai
 from ..utils.constants import (
     DOCUMENT_PAGE_RANGES, DOCUMENT_TYPES, DOCUMENT_KEYWORDS, 
     LP_STATUS, SUPPORTED_MIME_TYPES
 )
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from prompts.lp_details.contribution_agreement import (
     contribution_agg_sys_prompt, contribution_agg_user_prompt
 )
@@ -30,6 +31,85 @@ from prompts.lp_details.cml_prompt import (
     cml_system_prompt, cml_user_prompt
 )
 
+_DT_KYC = DOCUMENT_TYPES["KYC"]
+_DT_CA = DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
+_DT_CML = DOCUMENT_TYPES["CML"]
+
+# Document type -> Document.category
+_CATEGORY_MAPPING = {
+    _DT_KYC: "KYC",
+    _DT_CA: "Contribution Agreement",
+    _DT_CML: "CML"
+}
+
+# bool_or presence flags for the documents an LP needs, built once and reused per query
+_REQUIRED_DOC_PRESENCE = tuple(
+    func.bool_or(LPDocument.document_type == doc_type) for doc_type in (_DT_KYC, _DT_CA, _DT_CML)
+)
+
+# One alternation per document type, in DOCUMENT_KEYWORDS order: the first type with a
+# keyword in the filename or content wins, so "sha" inside "shall" cannot outrank KYC
+_KEYWORD_PATTERNS = tuple(
+    (DOCUMENT_TYPES[doc_type], re.compile("|".join(re.escape(k) for k in keywords)))
+    for doc_type, keywords in DOCUMENT_KEYWORDS.items()
+)
+
+# Looser filename-only fallback, tried type by type in this priority order
+_FILENAME_FALLBACK_PATTERNS = (
+    (_DT_KYC, re.compile(r"kyc")),
+    (_DT_CA, re.compile(r"contribution|agreement")),
+    (_DT_CML, re.compile(r"cml|master")),
+)
+
+
+@lru_cache(maxsize=1024)
+def _classify_filename(filename_lower: str) -> int:
+    """Index into _KEYWORD_PATTERNS of the first type matching a lowercased filename
+    (len(_KEYWORD_PATTERNS) if none); uploads often repeat name patterns"""
+    for position, (_, pattern) in enumerate(_KEYWORD_PATTERNS):
+        if pattern.search(filename_lower):
+            return position
+    return len(_KEYWORD_PATTERNS)
+
+# Extracted field -> LPDetails column, copied over whenever the value is truthy.
+# Fields needing conversion (commitment amount, ISIN, nominee) are handled inline.
+_CA_DIRECT_MAP = (
+    ("name_of_contributor", "lp_name"),
+    ("address_of_contributor", "address"),
+    ("email_id", "email"),
+    ("email_id", "email_for_drawdowns"),  # Default same
+    ("mobile_tel_no", "mobile_no"),
+    ("date_of_agreement", "date_of_agreement"),
+    ("class_subclass_of_units", "class_of_shares"),
+)
+
+_CML_DIRECT_MAP = (
+    ("pan", "pan"),
+    ("dob", "dob"),
+    ("doi", "doi"),
+    ("client_id", "client_id"),
+    ("dpid", "dpid"),
+    ("citizenship", "citizenship"),
+    ("type", "type"),
+    ("country", "geography"),
+    ("depository", "cml"),  # Depository goes to the CML field in LP_details
+)
+
+_ISIN_BY_CLASS = {"CLASS A": "INF1C8N22014", "CLASS B": "INF1C8N22022"}
+
+# User prompts split around their single text placeholder at import time, so each
+# call is a plain concatenation rather than a full str.format scan of the template.
+# Formatting with a sentinel first resolves the escaped {{ }} braces.
+_CA_PROMPT_PREFIX, _CA_PROMPT_SUFFIX = contribution_agg_user_prompt.format(ca_text="\0").split("\0")
+_CML_PROMPT_PREFIX, _CML_PROMPT_SUFFIX = cml_user_prompt.format(cml_text="\0").split("\0")
+
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _load_llm_json(response: str) -> Dict[str, Any]:
+    """Parse an LLM JSON reply with pydantic-core's native parser, tolerating markdown fences"""
+    return from_json(_JSON_FENCE_RE.sub("", response.strip()))
+
 
 class LPDocumentProcessor:
     """Service class for processing LP documents"""
@@ -37,36 +117,37 @@ class LPDocumentProcessor:
     def __init__(self, db: Session):
         self.db = db
     
-    def identify_document_type(self, filename: str, content: str = "") -> str:
+    def identify_document_type(self, filename: Union[str, bytes], content: str = "") -> str:
         """
         Identify document type based on filename and content
         
         Args:
-            filename: Name of the uploaded file
+            filename: Name of the uploaded file (str or filesystem bytes)
             content: Text content of the document (optional)
             
         Returns:
             Document type (KYC, CA, CML)
         """
-        filename_lower = filename.lower()
-        content_lower = content.lower()
-        
-        # Check filename and content for keywords
-        for doc_type, keywords in DOCUMENT_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in filename_lower or keyword in content_lower:
-                    return DOCUMENT_TYPES[doc_type]
+        filename_lower = os.fsdecode(filename).lower()
+        
+        # Check filename and content for keywords, type by type; content only needs
+        # checking for the types that come before the filename's own match
+        filename_position = _classify_filename(filename_lower)
+        if content:
+            content_lower = content.lower()
+            for doc_type, pattern in _KEYWORD_PATTERNS[:filename_position]:
+                if pattern.search(content_lower):
+                    return doc_type
+        if filename_position < len(_KEYWORD_PATTERNS):
+            return _KEYWORD_PATTERNS[filename_position][0]
         
         # Default fallback - try to guess from filename
-        if "kyc" in filename_lower:
-            return DOCUMENT_TYPES["KYC"]
-        elif "contribution" in filename_lower or "agreement" in filename_lower:
-            return DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
-        elif "cml" in filename_lower or "master" in filename_lower:
-            return DOCUMENT_TYPES["CML"]
+        for doc_type, pattern in _FILENAME_FALLBACK_PATTERNS:
+            if pattern.search(filename_lower):
+                return doc_type
         
         # If can't identify, default to KYC
-        return DOCUMENT_TYPES["KYC"]
+        return _DT_KYC
     
     def upload_document_to_drive(
         self, 
@@ -146,14 +227,14 @@ class LPDocumentProcessor:
             Dictionary with extracted fields
         """
         try:
-            user_prompt = contribution_agg_user_prompt.format(ca_text=text)
+            user_prompt = f"{_CA_PROMPT_PREFIX}{text}{_CA_PROMPT_SUFFIX}"
             response = get_response_from_openai(
                 system_prompt=contribution_agg_sys_prompt,
                 user_prompt=user_prompt,
                 model_name="gpt-4o-mini"
             )
             
-            return json.loads(response)
+            return _load_llm_json(response)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to process CA: {str(e)}")
     
@@ -168,14 +249,59 @@ class LPDocumentProcessor:
             Dictionary with extracted fields
         """
         try:
-            user_prompt = cml_user_prompt.format(cml_text=text)
+            user_prompt = f"{_CML_PROMPT_PREFIX}{text}{_CML_PROMPT_SUFFIX}"
             response = get_response_from_openai(
                 system_prompt=cml_system_prompt,
                 user_prompt=user_prompt,
                 model_name="gpt-4o-mini"
             )
             
-            return json.loads(response)
+            return _load_llm_json(response)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to process CML: {str(e)}")
+    
+    async def aprocess_contribution_agreement(self, text: str) -> Dict[str, Any]:
+        """
+        Async variant of process_contribution_agreement, so the CA and CML
+        LLM calls for one LP can run concurrently
+        
+        Args:
+            text: Extracted text from the document
+            
+        Returns:
+            Dictionary with extracted fields
+        """
+        try:
+            user_prompt = f"{_CA_PROMPT_PREFIX}{text}{_CA_PROMPT_SUFFIX}"
+            response = await aget_response_from_openai(
+                system_prompt=contribution_agg_sys_prompt,
+                user_prompt=user_prompt,
+                model_name="gpt-4o-mini"
+            )
+            
+            return _load_llm_json(response)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to process CA: {str(e)}")
+    
+    async def aprocess_cml_document(self, text: str) -> Dict[str, Any]:
+        """
+        Async variant of process_cml_document
+        
+        Args:
+            text: Extracted text from the document
+            
+        Returns:
+            Dictionary with extracted fields
+        """
+        try:
+            user_prompt = f"{_CML_PROMPT_PREFIX}{text}{_CML_PROMPT_SUFFIX}"
+            response = await aget_response_from_openai(
+                system_prompt=cml_system_prompt,
+                user_prompt=user_prompt,
+                model_name="gpt-4o-mini"
+            )
+            
+            return _load_llm_json(response)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to process CML: {str(e)}")
     
@@ -191,19 +317,10 @@ class LPDocumentProcessor:
         """
         lp_fields = {}
         
-        # Direct mappings - using new separate field names
-        if ca_data.get("name_of_contributor"):
-            lp_fields["lp_name"] = ca_data["name_of_contributor"]
-        
-        if ca_data.get("address_of_contributor"):
-            lp_fields["address"] = ca_data["address_of_contributor"]
-        
-        if ca_data.get("email_id"):
-            lp_fields["email"] = ca_data["email_id"]
-            lp_fields["email_for_drawdowns"] = ca_data["email_id"]  # Default same
-        
-        if ca_data.get("mobile_tel_no"):
-            lp_fields["mobile_no"] = ca_data["mobile_tel_no"]
+        for src, dst in _CA_DIRECT_MAP:
+            value = ca_data.get(src)
+            if value:
+                lp_fields[dst] = value
         
         if ca_data.get("amount_of_capital_commitment"):
             # Clean and convert commitment amount
@@ -213,18 +330,12 @@ class LPDocumentProcessor:
             except ValueError:
                 pass
         
-        if ca_data.get("date_of_agreement"):
-            lp_fields["date_of_agreement"] = ca_data["date_of_agreement"]
-        
         if ca_data.get("class_subclass_of_units"):
-            lp_fields["class_of_shares"] = ca_data["class_subclass_of_units"]
-            
             # ISIN mapping logic based on class of units
             class_of_units = ca_data["class_subclass_of_units"].upper()
-            if "CLASS A" in class_of_units:
-                lp_fields["isin"] = "INF1C8N22014"
-            elif "CLASS B" in class_of_units:
-                lp_fields["isin"] = "INF1C8N22022"
+            isin = next((isin for cls, isin in _ISIN_BY_CLASS.items() if cls in class_of_units), None)
+            if isin:
+                lp_fields["isin"] = isin
         
         # Handle nominee details
         nominee_details = ca_data.get("details_of_nominee", {})
@@ -246,33 +357,10 @@ class LPDocumentProcessor:
         lp_fields = {}
         
         # Direct mappings - only fields that exist in LP Details model
-        if cml_data.get("pan"):
-            lp_fields["pan"] = cml_data["pan"]
-        
-        if cml_data.get("dob"):
-            lp_fields["dob"] = cml_data["dob"]
-        
-        if cml_data.get("doi"):
-            lp_fields["doi"] = cml_data["doi"]
-        
-        if cml_data.get("client_id"):
-            lp_fields["client_id"] = cml_data["client_id"]
-        
-        if cml_data.get("dpid"):
-            lp_fields["dpid"] = cml_data["dpid"]
-        
-        if cml_data.get("citizenship"):
-            lp_fields["citizenship"] = cml_data["citizenship"]
-        
-        if cml_data.get("type"):
-            lp_fields["type"] = cml_data["type"]
-        
-        if cml_data.get("country"):
-            lp_fields["geography"] = cml_data["country"]
-        
-        # Map depository field to CML field in LP_details
-        if cml_data.get("depository"):
-            lp_fields["cml"] = cml_data["depository"]
+        for src, dst in _CML_DIRECT_MAP:
+            value = cml_data.get(src)
+            if value:
+                lp_fields[dst] = value
         
         # Note: Fields like dp, clid, first_holder_pan, client_type, 
         # number_of_foreign_investors are extracted from CML but not stored in LP model
@@ -289,15 +377,10 @@ class LPDocumentProcessor:
         Returns:
             New status
         """
-        # Get associated documents
-        lp_documents = self.db.query(LPDocument).filter(LPDocument.lp_id == lp.lp_id).all()
-        
-        # Check which document types are present
-        doc_types = [doc.document_type for doc in lp_documents]
-        
-        has_kyc = DOCUMENT_TYPES["KYC"] in doc_types
-        has_ca = DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"] in doc_types
-        has_cml = DOCUMENT_TYPES["CML"] in doc_types
+        # Presence of each required document type, aggregated in one row by the database
+        has_kyc, has_ca, has_cml = self.db.query(*_REQUIRED_DOC_PRESENCE).filter(
+            LPDocument.lp_id == lp.lp_id
+        ).one()
         
         # Determine status based on document availability
         if not has_kyc:
@@ -313,7 +396,8 @@ class LPDocumentProcessor:
         document_type: str,
         file_path: str,
         drive_result: Dict[str, Any],
-        expiry_date: Optional[str] = None
+        expiry_date: Optional[str] = None,
+        flush: bool = True
     ) -> Document:
         """
         Create a document record in the database
@@ -324,21 +408,15 @@ class LPDocumentProcessor:
             file_path: Local file path
             drive_result: Result from Drive upload
             expiry_date: Expiry date for the document (optional)
+            flush: If False, return the unsaved instance for a later flush_pending call
             
         Returns:
             Created Document instance
         """
-        # Map document type to category
-        category_mapping = {
-            DOCUMENT_TYPES["KYC"]: "KYC",
-            DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]: "Contribution Agreement",
-            DOCUMENT_TYPES["CML"]: "CML"
-        }
-        
         document = Document(
             document_id=uuid.uuid4(),
             name=file_name,
-            category=category_mapping.get(document_type, "CML"),
+            category=_CATEGORY_MAPPING.get(document_type, "CML"),
             file_path=file_path,
             drive_file_id=drive_result.get("id"),
             drive_link=drive_result.get("shared_links", {}).get("uploader"),
@@ -348,23 +426,24 @@ class LPDocumentProcessor:
         # Set expiry date if provided
         if expiry_date:
             try:
-                from datetime import datetime
                 # Try to parse the date string
-                parsed_date = datetime.strptime(expiry_date, "%Y-%m-%d").date()
+                parsed_date = date.fromisoformat(expiry_date)
                 document.expiry_date = parsed_date
             except ValueError:
                 # If parsing fails, leave expiry_date as None
                 pass
         
-        self.db.add(document)
-        self.db.flush()
+        if flush:
+            self.db.add(document)
+            self.db.flush()
         return document
     
     def create_lp_document_association(
         self, 
         lp_id: uuid.UUID, 
         document_id: uuid.UUID, 
-        document_type: str
+        document_type: str,
+        flush: bool = True
     ) -> LPDocument:
         """
         Create LP-Document association
@@ -373,6 +452,7 @@ class LPDocumentProcessor:
             lp_id: LP ID
             document_id: Document ID
             document_type: Type of document
+            flush: If False, return the unsaved instance for a later flush_pending call
             
         Returns:
             Created LPDocument instance
@@ -383,6 +463,20 @@ class LPDocumentProcessor:
             document_type=document_type
         )
         
-        self.db.add(lp_document)
-        self.db.flush()
-        return lp_document 
\ No newline at end of file
+        if flush:
+            self.db.add(lp_document)
+            self.db.flush()
+        return lp_document
+    
+    def flush_pending(self, documents: List[Document], associations: List[LPDocument]) -> None:
+        """
+        Add documents and their LP associations in one unit of work.
+        Document IDs are generated client-side, so associations can be built
+        before anything is flushed and each table is written in a single batch.
+        
+        Args:
+            documents: Document instances created with flush=False
+            associations: LPDocument instances created with flush=False
+        """
+        self.db.add_all([*documents, *associations])
+        self.db.flush() 
\ No newline at end of file
@@ -1,12 +1,17 @@
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Set, Tuple, Optional, Any
 from decimal import Decimal
-from datetime import date, datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, func, tuple_, update
+from pydantic import ValidationError
 import logging
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-import tempfile
 
 from ..models import (
     LPPayment, LPPaymentStatus, PaymentReconciliation, PaymentReconciliationStatus,
@@ -16,10 +21,7 @@ from ..api.drawdowns import calculate_quarter_string
 from ..schemas.payment_reconciliation import LLMProcessingResult, LLMPaymentExtraction
 from ..utils.llm import get_response_from_openai
 from ..utils.pdf_extractor import extract_text_from_pdf
-from ..utils.s3_storage import get_s3_storage
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from ..utils.s3_storage import get_s3_storage, extract_s3_key_from_url
 from prompts.payment_reconillation.payment_reconcillation import (
     payment_reconcillation_system_prompt,
     payment_reconcillation_user_prompt
@@ -27,6 +29,67 @@ from prompts.payment_reconillation.payment_reconcillation import (
 
 logger = logging.getLogger(__name__)
 
+# The user prompt split around its two placeholders once, so building it is plain concatenation
+_USER_PROMPT_HEAD, _USER_PROMPT_MID, _USER_PROMPT_TAIL = payment_reconcillation_user_prompt.format(
+    account_statement="\0", db_lp_list="\0"
+).split("\0")
+
+
+@lru_cache(maxsize=64)
+def _lp_list_json(db_lp_list: Tuple[str, ...]) -> str:
+    # Funds are reconciled repeatedly with the same LPs, so their serialized list is reused
+    return json.dumps({"db_lp_list": list(db_lp_list)})
+
+# LLM replies for bank statements are cached in-process so re-uploads and retries of the
+# same statement skip the OpenAI call. Keys combine the PDF bytes, the prompt templates,
+# the model and the fund's LP list, so a change to any of them misses the cache.
+_LLM_MODEL = "gpt-4.1-mini"
+_PROMPT_FINGERPRINT = hashlib.sha256(
+    (payment_reconcillation_system_prompt + payment_reconcillation_user_prompt).encode()
+).hexdigest()[:16]
+_LLM_RESPONSE_TTL = timedelta(days=7)
+_LLM_MAX_ATTEMPTS = 3
+_LLM_CACHE_MAX_ENTRIES = 128
+# Every entry gets the same TTL, so insertion order is also expiry order; requests run in
+# worker threads, so all access goes through the lock
+_llm_response_cache: OrderedDict[str, Tuple[datetime, str]] = OrderedDict()
+_llm_response_cache_lock = threading.Lock()
+
+# Bank statement uploads run here so they overlap the remaining DB work of a request
+_s3_upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bank-statement-s3")
+
+
+def _llm_cache_key(pdf_content: bytes, db_lp_list: List[str]) -> str:
+    lp_list_digest = hashlib.sha256(json.dumps(sorted(db_lp_list)).encode()).hexdigest()
+    return ":".join((
+        hashlib.sha256(pdf_content).hexdigest(), _PROMPT_FINGERPRINT, _LLM_MODEL, lp_list_digest
+    ))
+
+
+def _get_cached_llm_response(key: str) -> Optional[str]:
+    with _llm_response_cache_lock:
+        entry = _llm_response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= datetime.now():
+            del _llm_response_cache[key]
+            return None
+        return response
+
+
+def _cache_llm_response(key: str, response: str) -> None:
+    now = datetime.now()
+    with _llm_response_cache_lock:
+        _llm_response_cache[key] = (now + _LLM_RESPONSE_TTL, response)
+        _llm_response_cache.move_to_end(key)
+        # Drop expired entries from the oldest end, then the oldest live ones beyond the cap
+        while _llm_response_cache:
+            oldest_expiry, _ = next(iter(_llm_response_cache.values()))
+            if oldest_expiry > now and len(_llm_response_cache) <= _LLM_CACHE_MAX_ENTRIES:
+                break
+            _llm_response_cache.popitem(last=False)
+
 class PaymentReconciliationService:
     
     def __init__(self, db: Session):
@@ -40,7 +103,6 @@ class PaymentReconciliationService:
         filename: str = "bank_statement"
     ) -> Optional[str]:
         """Upload bank statement PDF to S3 and return the S3 URL"""
-        temp_pdf_path = None
         try:
             s3_storage = get_s3_storage()
             
@@ -54,11 +116,6 @@ class PaymentReconciliationService:
             # S3 key: FundScheme/Quarter/Bank Statements/bank_statement_timestamp.pdf
             s3_key = f"{safe_fund_name}/{quarter}/Bank Statements/{filename}_{timestamp}.pdf"
             
-            # Create temporary file to store PDF content (following drawdowns pattern)
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_pdf_path = temp_file.name
-            
             # Prepare metadata
             metadata = {
                 'document_type': 'bank_statement',
@@ -67,9 +124,9 @@ class PaymentReconciliationService:
                 'upload_timestamp': timestamp
             }
             
-            # Upload to S3 using local file path (following drawdowns pattern)
-            upload_result = s3_storage.upload_file(
-                local_file_path=temp_pdf_path,
+            # Upload the in-memory PDF directly
+            upload_result = s3_storage.upload_bytes(
+                content=pdf_content,
                 s3_key=s3_key,
                 metadata=metadata,
                 content_type='application/pdf'
@@ -85,13 +142,6 @@ class PaymentReconciliationService:
         except Exception as e:
             logger.error(f"Error uploading bank statement to S3: {str(e)}")
             return None
-        finally:
-            # Clean up temporary file
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                try:
-                    os.unlink(temp_pdf_path)
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to cleanup temporary file {temp_pdf_path}: {cleanup_error}")
     
     def calculate_payment_status(self, paid_amount: Decimal, expected_amount: Decimal) -> str:
         """Calculate payment status based on amounts"""
@@ -142,6 +192,55 @@ class PaymentReconciliationService:
             
         return updated
     
+    def update_drawdown_statuses_if_paid(
+        self, fund_id: int, paid_keys: Set[Tuple[Any, str]]
+    ) -> Set[Tuple[Any, str]]:
+        """Batch form of update_drawdown_status_if_paid for a set of (lp_id, quarter) keys.
+        Returns the keys whose DrawdownNotice or LPDrawdown status was moved to
+        ALLOTMENT_SHEET_GENERATION_PENDING."""
+        if not paid_keys:
+            return set()
+        
+        updated_keys = set()
+        pending = DrawdownNoticeStatus.DRAWDOWN_PAYMENT_PENDING.value
+        next_status = DrawdownNoticeStatus.ALLOTMENT_SHEET_GENERATION_PENDING.value
+        
+        try:
+            key_by_drawdown_id = {
+                drawdown_id: (lp_id, quarter)
+                for drawdown_id, lp_id, quarter in self.db.query(
+                    LPDrawdown.drawdown_id, LPDrawdown.lp_id, LPDrawdown.drawdown_quarter
+                ).filter(
+                    and_(
+                        LPDrawdown.fund_id == fund_id,
+                        tuple_(LPDrawdown.lp_id, LPDrawdown.drawdown_quarter).in_(list(paid_keys))
+                    )
+                ).all()
+            }
+            if not key_by_drawdown_id:
+                return updated_keys
+            
+            for model in (DrawdownNotice, LPDrawdown):
+                updated_ids = self.db.execute(
+                    update(model)
+                    .where(
+                        and_(
+                            model.drawdown_id.in_(list(key_by_drawdown_id)),
+                            model.status == pending
+                        )
+                    )
+                    .values(status=next_status)
+                    .returning(model.drawdown_id)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                updated_keys.update(key_by_drawdown_id[drawdown_id] for drawdown_id in updated_ids)
+                logger.info(f"Updated {len(updated_ids)} {model.__name__} rows to ALLOTMENT_SHEET_GENERATION_PENDING")
+                
+        except Exception as e:
+            logger.error(f"Error updating drawdown statuses: {str(e)}")
+            
+        return updated_keys
+    
     def manual_record_payment(
         self, 
         lp_id: str, 
@@ -213,6 +312,33 @@ class PaymentReconciliationService:
         
         return payment, drawdown_status_updated
     
+    def extract_payments_with_llm(self, user_prompt: str) -> Tuple[LLMProcessingResult, str]:
+        """
+        Call the LLM and validate its JSON reply, feeding validation errors back to the
+        model and retrying instead of failing the whole upload on one malformed reply.
+        Returns the parsed result and the raw reply that produced it.
+        """
+        followup_messages = []
+        for attempt in range(1, _LLM_MAX_ATTEMPTS + 1):
+            llm_response = get_response_from_openai(
+                system_prompt=payment_reconcillation_system_prompt,
+                user_prompt=user_prompt,
+                model_name=_LLM_MODEL,
+                followup_messages=followup_messages
+            )
+            try:
+                # Parse and validate the LLM JSON in one pass (no intermediate dict)
+                return LLMProcessingResult.model_validate_json(llm_response), llm_response
+            except ValidationError as e:
+                if attempt == _LLM_MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"LLM output failed validation (attempt {attempt}/{_LLM_MAX_ATTEMPTS}): {str(e)}")
+                followup_messages = [
+                    {"role": "assistant", "content": llm_response},
+                    {"role": "user", "content": f"Your previous output failed validation: {e}. "
+                                                "Return ONLY valid JSON matching the schema."}
+                ]
+    
     def process_bank_statement_with_llm(
         self, 
         pdf_content: bytes, 
@@ -221,35 +347,6 @@ class PaymentReconciliationService:
     ) -> Tuple[PaymentReconciliation, List[LPPayment], List[Dict]]:
         """Process bank statement PDF using LLM and create payment records"""
         
-        # Create temporary file to store PDF content
-        temp_pdf_path = None
-        try:
-            # Create temporary file with .pdf extension
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_pdf_path = temp_file.name
-            
-            # Extract text from PDF using file path
-            account_statement, _, _ = extract_text_from_pdf(temp_pdf_path)
-            
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
-            # Clean up temporary file if it was created
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                try:
-                    os.unlink(temp_pdf_path)
-                except:
-                    pass
-            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-        
-        finally:
-            # Clean up temporary file
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                try:
-                    os.unlink(temp_pdf_path)
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to cleanup temporary file {temp_pdf_path}: {cleanup_error}")
-        
         # Get LP list for the fund
         lps = self.db.query(LPDetails).filter(LPDetails.fund_id == fund_id).all()
         if not lps:
@@ -257,29 +354,42 @@ class PaymentReconciliationService:
         
         db_lp_list = [lp.lp_name for lp in lps]
         
-        # Create LLM prompt
-        user_prompt = payment_reconcillation_user_prompt.format(
-            account_statement=account_statement,
-            db_lp_list=json.dumps({"db_lp_list": db_lp_list})
-        )
+        # A statement already processed against the same LPs reuses the cached LLM reply,
+        # which also makes its text extraction unnecessary
+        llm_cache_key = _llm_cache_key(pdf_content, db_lp_list)
+        llm_response = _get_cached_llm_response(llm_cache_key)
         
-        # Call LLM
-        try:
-            llm_response = get_response_from_openai(
-                system_prompt=payment_reconcillation_system_prompt,
-                user_prompt=user_prompt
-            )
+        if llm_response is None:
+            # Extract text from the in-memory PDF
+            try:
+                account_statement, _, _ = extract_text_from_pdf(pdf_content, include_images=False)
+            except Exception as e:
+                logger.error(f"Error extracting text from PDF: {str(e)}")
+                raise ValueError(f"Failed to extract text from PDF: {str(e)}")
             
-            # Parse LLM response
-            llm_result = json.loads(llm_response)
-            extracted_payments = LLMProcessingResult(**llm_result)
+            # Create LLM prompt
+            user_prompt = (
+                f"{_USER_PROMPT_HEAD}{account_statement}"
+                f"{_USER_PROMPT_MID}{_lp_list_json(tuple(db_lp_list))}{_USER_PROMPT_TAIL}"
+            )
+        
+        try:
+            if llm_response is None:
+                extracted_payments, llm_response = self.extract_payments_with_llm(user_prompt)
+            else:
+                logger.info("Using cached LLM response for bank statement")
+                extracted_payments = LLMProcessingResult.model_validate_json(llm_response)
+            _cache_llm_response(llm_cache_key, llm_response)
             
         except Exception as e:
             logger.error(f"LLM processing failed: {str(e)}")
             raise ValueError(f"Failed to process bank statement with LLM: {str(e)}")
         
         # Get all drawdowns for this fund (we'll match by quarter per payment)
-        all_drawdowns = self.db.query(LPDrawdown).filter(LPDrawdown.fund_id == fund_id).all()
+        # LPs are loaded in the same query so drawdown.lp never needs a follow-up SELECT
+        all_drawdowns = self.db.query(LPDrawdown).options(
+            joinedload(LPDrawdown.lp)
+        ).filter(LPDrawdown.fund_id == fund_id).all()
         
         if not all_drawdowns:
             raise ValueError(f"No drawdowns found for fund {fund_id}")
@@ -287,7 +397,7 @@ class PaymentReconciliationService:
         # Create a mapping of (LP name, quarter) to drawdowns
         lp_quarter_to_drawdown = {}
         for drawdown in all_drawdowns:
-            lp = self.db.query(LPDetails).filter(LPDetails.lp_id == drawdown.lp_id).first()
+            lp = drawdown.lp
             if lp:
                 key = (lp.lp_name, drawdown.drawdown_quarter)
                 lp_quarter_to_drawdown[key] = drawdown
@@ -298,37 +408,51 @@ class PaymentReconciliationService:
         total_received = Decimal('0')
         matched_payments = 0
         quarters_processed = set()
+        paid_results = []
         
+        # Resolve each extraction's date, quarter and drawdown up front so duplicates
+        # can be checked against existing payments in a single query
+        candidates = []
         for extraction in extracted_payments.results:
+            # Parse payment date and determine quarter
             try:
-                # Parse payment date and determine quarter
-                try:
-                    payment_date = datetime.strptime(extraction.payment_date, "%Y-%m-%d").date()
-                    payment_quarter = calculate_quarter_string(payment_date)
-                except ValueError:
-                    logger.warning(f"Invalid payment date format: {extraction.payment_date}")
-                    continue
-                
-                quarters_processed.add(payment_quarter)
-                
-                # Find matching drawdown using LP name and calculated quarter
-                drawdown_key = (extraction.db_lp_name, payment_quarter)
-                drawdown = lp_quarter_to_drawdown.get(drawdown_key)
-                if not drawdown:
-                    logger.warning(f"No drawdown found for LP: {extraction.db_lp_name}, quarter: {payment_quarter}")
-                    continue
-                
-                # Check for duplicate payment (same LP, quarter, date, and amount)
-                existing_payment = self.db.query(LPPayment).filter(
+                payment_date = datetime.strptime(extraction.payment_date, "%Y-%m-%d").date()
+                payment_quarter = calculate_quarter_string(payment_date)
+            except ValueError:
+                logger.warning(f"Invalid payment date format: {extraction.payment_date}")
+                continue
+            
+            quarters_processed.add(payment_quarter)
+            
+            # Find matching drawdown using LP name and calculated quarter
+            drawdown_key = (extraction.db_lp_name, payment_quarter)
+            drawdown = lp_quarter_to_drawdown.get(drawdown_key)
+            if not drawdown:
+                logger.warning(f"No drawdown found for LP: {extraction.db_lp_name}, quarter: {payment_quarter}")
+                continue
+            
+            candidates.append((extraction, payment_date, payment_quarter, drawdown))
+        
+        # Existing payments keyed by (LP, quarter, date, amount) for duplicate detection
+        existing_payment_keys = set()
+        if candidates:
+            existing_payment_keys = set(
+                self.db.query(
+                    LPPayment.lp_id, LPPayment.quarter, LPPayment.payment_date, LPPayment.paid_amount
+                ).filter(
                     and_(
-                        LPPayment.lp_id == drawdown.lp_id,
-                        LPPayment.quarter == payment_quarter,
-                        LPPayment.payment_date == payment_date,
-                        LPPayment.paid_amount == extraction.credit_amount
+                        LPPayment.lp_id.in_({drawdown.lp_id for _, _, _, drawdown in candidates}),
+                        LPPayment.quarter.in_({quarter for _, _, quarter, _ in candidates}),
+                        LPPayment.payment_date.in_({payment_date for _, payment_date, _, _ in candidates})
                     )
-                ).first()
-                
-                if existing_payment:
+                ).all()
+            )
+        
+        for extraction, payment_date, payment_quarter, drawdown in candidates:
+            try:
+                # Check for duplicate payment (same LP, quarter, date, and amount)
+                payment_key = (drawdown.lp_id, payment_quarter, payment_date, extraction.credit_amount)
+                if payment_key in existing_payment_keys:
                     logger.info(f"Skipping duplicate payment for LP {extraction.db_lp_name}, quarter {payment_quarter}, "
                                f"date {payment_date}, amount {extraction.credit_amount}")
                     continue
@@ -349,29 +473,27 @@ class PaymentReconciliationService:
                     notes=f"Automatic extraction: {extraction.reasoning}"
                 )
                 
+                # Add to per_lp results; drawdown status is updated for all paid LPs after the loop
+                lp_result = {
+                    "lp_id": str(drawdown.lp_id),  # Return actual UUID
+                    "lp_name": drawdown.lp.lp_name,
+                    "expected": drawdown.drawdown_amount,
+                    "received": extraction.credit_amount,
+                    "status": status,
+                    "drawdown_status_updated": False
+                }
+                
+                # Record the extraction only once everything above succeeded, so a failure
+                # skips this payment entirely instead of leaving it half-applied
+                existing_payment_keys.add(payment_key)
                 self.db.add(payment)
-                self.db.flush()
                 created_payments.append(payment)
+                per_lp_results.append(lp_result)
                 
-                # Update drawdown status if paid
-                drawdown_status_updated = False
                 if status == LPPaymentStatus.PAID.value:
-                    drawdown_status_updated = self.update_drawdown_status_if_paid(
-                        str(drawdown.lp_id), fund_id, payment_quarter
-                    )
+                    paid_results.append(((drawdown.lp_id, payment_quarter), lp_result))
                     matched_payments += 1
                 
-                # Add to per_lp results
-                lp = self.db.query(LPDetails).filter(LPDetails.lp_id == drawdown.lp_id).first()
-                per_lp_results.append({
-                    "lp_id": str(drawdown.lp_id),  # Return actual UUID
-                    "lp_name": lp.lp_name,
-                    "expected": drawdown.drawdown_amount,
-                    "received": extraction.credit_amount,
-                    "status": status,
-                    "drawdown_status_updated": drawdown_status_updated
-                })
-                
                 total_received += extraction.credit_amount
                 
             except Exception as e:
@@ -383,12 +505,6 @@ class PaymentReconciliationService:
             logger.warning(f"No new payments created for fund {fund_id} - all payments were duplicates or no matches found")
             raise ValueError("No new payments were created. All payments in the bank statement already exist or no matching LPs were found.")
         
-        # Calculate total expected for all quarters processed
-        total_expected = Decimal('0')
-        for quarter in quarters_processed:
-            quarter_drawdowns = [d for d in all_drawdowns if d.drawdown_quarter == quarter]
-            total_expected += sum(d.drawdown_amount for d in quarter_drawdowns)
-        
         # Use sorted list of quarters processed
         quarters_list = sorted(list(quarters_processed)) if quarters_processed else ["N/A"]
         drawdown_quarters_string = ", ".join(quarters_list)
@@ -397,37 +513,77 @@ class PaymentReconciliationService:
         fund = self.db.query(FundDetails).filter(FundDetails.fund_id == fund_id).first()
         fund_name = fund.scheme_name if fund else f"Fund_{fund_id}"
         
-        # Upload bank statement to S3 (only if we have new payments)
-        s3_url = self.upload_bank_statement_to_s3(
+        # Upload bank statement to S3 (only if we have new payments) in the background;
+        # it needs no DB access, so it overlaps the status updates and totals below
+        s3_future = _s3_upload_executor.submit(
+            self.upload_bank_statement_to_s3,
             pdf_content=pdf_content,
             fund_name=fund_name,
             quarter=drawdown_quarters_string,
             filename=filename
         )
         
-        # Create reconciliation record
-        overall_status = PaymentReconciliationStatus.COMPLETED.value if matched_payments > 0 else PaymentReconciliationStatus.IN_PROGRESS.value
-        
-        reconciliation = PaymentReconciliation(
-            fund_id=fund_id,
-            drawdown_quarter=drawdown_quarters_string,
-            total_expected=total_expected,
-            total_received=total_received,
-            overall_status=overall_status,
-            processed_payments=len(extracted_payments.results),
-            matched_payments=matched_payments,
-            payment_s3_link=s3_url
-        )
-        
-        self.db.add(reconciliation)
-        self.db.flush()  # Get the reconciliation payment_id
-        
-        # Update all created payments to reference this reconciliation
-        for payment in created_payments:
-            payment.payment_id = reconciliation.payment_id
+        try:
+            # Move drawdowns of fully paid LPs forward in one batch
+            updated_keys = self.update_drawdown_statuses_if_paid(fund_id, {key for key, _ in paid_results})
+            for key, lp_result in paid_results:
+                lp_result["drawdown_status_updated"] = key in updated_keys
+            
+            # Calculate total expected for all quarters processed, summed by the database
+            quarter_totals = self.db.query(
+                LPDrawdown.drawdown_quarter, func.sum(LPDrawdown.drawdown_amount)
+            ).filter(
+                and_(
+                    LPDrawdown.fund_id == fund_id,
+                    LPDrawdown.drawdown_quarter.in_(quarters_processed)
+                )
+            ).group_by(LPDrawdown.drawdown_quarter).all()
+            total_expected = sum((total for _, total in quarter_totals), Decimal('0'))
+            
+            # upload_bank_statement_to_s3 logs and returns None on failure, so this does not raise
+            s3_url = s3_future.result()
+            
+            # Create reconciliation record
+            overall_status = PaymentReconciliationStatus.COMPLETED.value if matched_payments > 0 else PaymentReconciliationStatus.IN_PROGRESS.value
+            
+            reconciliation = PaymentReconciliation(
+                fund_id=fund_id,
+                drawdown_quarter=drawdown_quarters_string,
+                total_expected=total_expected,
+                total_received=total_received,
+                overall_status=overall_status,
+                processed_payments=len(extracted_payments.results),
+                matched_payments=matched_payments,
+                payment_s3_link=s3_url
+            )
+            
+            # Link the new payments through the relationship so one flush inserts the
+            # reconciliation first and then every payment in a single batch with payment_id set
+            reconciliation.lp_payments.extend(created_payments)
+            self.db.add(reconciliation)
+            self.db.flush()
+        except Exception:
+            # The DB work failed after the upload started, so don't leave an orphaned statement in S3
+            self.delete_bank_statement_from_s3(s3_future.result())
+            raise
         
         return reconciliation, created_payments, per_lp_results
     
+    def delete_bank_statement_from_s3(self, s3_url: Optional[str]) -> bool:
+        """Delete an uploaded bank statement PDF from S3, returning whether it was removed"""
+        if not s3_url:
+            return False
+        try:
+            s3_storage = get_s3_storage()
+            s3_key = extract_s3_key_from_url(s3_url, s3_storage.bucket_name, s3_storage.region_name)
+            if s3_storage.delete_object(s3_key).get('success', False):
+                logger.info(f"Deleted S3 file: {s3_key}")
+                return True
+            logger.warning(f"Failed to delete S3 file: {s3_key}")
+        except Exception as e:
+            logger.error(f"Error deleting S3 file: {str(e)}")
+        return False
+    
     def update_payment_and_status(
         self,
         lp_payment_id: int,
@@ -476,14 +632,15 @@ class PaymentReconciliationService:
         if not reconciliation:
             raise ValueError(f"Payment reconciliation {payment_id} not found")
         
-        # Get all associated LP payments
-        lp_payments = self.db.query(LPPayment).filter(
+        # Get all associated LP payments, with their LPs in the same query for the snapshot
+        lp_payments = self.db.query(LPPayment).options(
+            joinedload(LPPayment.lp)
+        ).filter(
             LPPayment.payment_id == payment_id
         ).all()
         
         deleted_lp_payments = []
         
-        # Delete all LP payments first (cascade delete)
         for lp_payment in lp_payments:
             deleted_lp_payments.append({
                 "lp_payment_id": lp_payment.lp_payment_id,
@@ -491,7 +648,12 @@ class PaymentReconciliationService:
                 "paid_amount": lp_payment.paid_amount,
                 "quarter": lp_payment.quarter
             })
-            self.db.delete(lp_payment)
+        
+        # Delete all LP payments first, in a single DELETE; the loaded rows are only
+        # read for the snapshot above, so the session need not be synchronized
+        self.db.query(LPPayment).filter(
+            LPPayment.payment_id == payment_id
+        ).delete(synchronize_session=False)
         
         # Store reconciliation info before deletion
         reconciliation_info = {
@@ -512,9 +674,9 @@ class PaymentReconciliationService:
                 s3_storage = get_s3_storage()
                 # Extract S3 key from URL
                 if reconciliation.payment_s3_link.startswith('https://') and 's3' in reconciliation.payment_s3_link:
-                    # Parse S3 URL to get key
-                    url_parts = reconciliation.payment_s3_link.split('/')
-                    s3_key = '/'.join(url_parts[3:])  # Everything after bucket/s3/region/
+                    s3_key = extract_s3_key_from_url(
+                        reconciliation.payment_s3_link, s3_storage.bucket_name, s3_storage.region_name
+                    )
                     delete_result = s3_storage.delete_object(s3_key)
                     s3_deletion_success = delete_result.get('success', False)
                     if s3_deletion_success:
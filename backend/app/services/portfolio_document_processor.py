@@ -3,13 +3,13 @@ Service for processing Portfolio documents (SHA - Shareholders Agreement)
 Handles document upload, text extraction, and data population for portfolio companies
 """
 
-import os
 import json
 import uuid
 from typing import Dict, Any, Optional, List, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException
-from datetime import datetime, date
+from datetime import date
 
 from ..models.document import Document
 from ..models.portfolio_document import PortfolioDocument
@@ -18,13 +18,11 @@ from ..models.portfolio_founder import PortfolioFounder
 from ..models.portfolio_investment import PortfolioInvestment
 from ..utils.google_clients_gcp import drive_file_dump
 from ..utils.pdf_extractor import extract_text_from_specific_pages, extract_text_from_pdf
-from ..utils.llm import get_response_from_openai
+from ..utils.llm import get_response_from_openai, aget_response_from_openai
 from ..utils.constants import (
     DOCUMENT_PAGE_RANGES, DOCUMENT_TYPES, DOCUMENT_KEYWORDS, 
     SUPPORTED_MIME_TYPES
 )
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from prompts.portfolio.sha_prompt import (
     sha_system_prompt, sha_user_prompt
 )
@@ -125,6 +123,29 @@ class PortfolioDocumentProcessor:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to process SHA: {str(e)}")
     
+    async def aprocess_sha_document(self, text: str) -> Dict[str, Any]:
+        """
+        Async variant of process_sha_document, so awaiting the LLM does not block
+        the event loop and concurrent SHA uploads are not serialized
+        
+        Args:
+            text: Extracted text from the document
+            
+        Returns:
+            Dictionary with extracted fields
+        """
+        try:
+            user_prompt = sha_user_prompt.format(sha_text=text)
+            response = await aget_response_from_openai(
+                system_prompt=sha_system_prompt,
+                user_prompt=user_prompt,
+                model_name="gpt-4.1-mini"
+            )
+            
+            return json.loads(response)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to process SHA: {str(e)}")
+    
     def map_sha_fields_to_portfolio(self, sha_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Map SHA fields to portfolio model fields
@@ -148,7 +169,7 @@ class PortfolioDocumentProcessor:
         if sha_data.get("execution_date"):
             try:
                 # Parse the date string (assuming YYYY-MM-DD format)
-                sha_sign_date = datetime.strptime(sha_data["execution_date"], "%Y-%m-%d").date()
+                sha_sign_date = date.fromisoformat(sha_data["execution_date"])
                 portfolio_fields["sha_sign_date"] = sha_sign_date
             except (ValueError, TypeError):
                 # If parsing fails, store as string for manual review
@@ -197,7 +218,7 @@ class PortfolioDocumentProcessor:
             parsed_expiry_date = None
             if expiry_date:
                 try:
-                    parsed_expiry_date = datetime.strptime(expiry_date, "%Y-%m-%d").date()
+                    parsed_expiry_date = date.fromisoformat(expiry_date)
                 except ValueError:
                     pass  # Ignore invalid date format
             
@@ -228,7 +249,8 @@ class PortfolioDocumentProcessor:
         company_id: int,
         document_id: uuid.UUID,
         document_type: str,
-        doc_link: Optional[str] = None
+        doc_link: Optional[str] = None,
+        flush: bool = True
     ) -> PortfolioDocument:
         """
         Create portfolio-document association
@@ -238,6 +260,8 @@ class PortfolioDocumentProcessor:
             document_id: Document ID
             document_type: Type of document
             doc_link: Optional document link
+            flush: If False, the association is only added to the session and is
+                   written by the caller's next flush or commit
             
         Returns:
             Created PortfolioDocument instance
@@ -251,12 +275,32 @@ class PortfolioDocumentProcessor:
             )
             
             self.db.add(portfolio_doc)
-            self.db.flush()
+            if flush:
+                self.db.flush()
             
             return portfolio_doc
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create portfolio document association: {str(e)}")
     
+    def _merge_company_data(self, company_data: Dict[str, Any], extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge UI company data with the fields extracted from the SHA"""
+        merged_data = {**company_data}
+        
+        # Add extracted fields with fallbacks
+        if extracted_data.get("company_name"):
+            merged_data["company_name"] = extracted_data["company_name"]
+        else:
+            # Fallback: Use startup_brand as company_name if SHA extraction failed
+            merged_data["company_name"] = company_data.get("startup_brand", "Unknown Company")
+        
+        if extracted_data.get("registered_address"):
+            merged_data["registered_address"] = extracted_data["registered_address"]
+        else:
+            # Fallback: Set a default placeholder if no address extracted
+            merged_data["registered_address"] = "Address to be updated"
+        
+        return merged_data
+    
     def create_company_record(self, company_data: Dict[str, Any], extracted_data: Dict[str, Any]) -> PortfolioCompany:
         """
         Create portfolio company record
@@ -269,24 +313,8 @@ class PortfolioDocumentProcessor:
             Created PortfolioCompany instance
         """
         try:
-            # Merge UI data with extracted data
-            merged_data = {**company_data}
-            
-            # Add extracted fields with fallbacks
-            if extracted_data.get("company_name"):
-                merged_data["company_name"] = extracted_data["company_name"]
-            else:
-                # Fallback: Use startup_brand as company_name if SHA extraction failed
-                merged_data["company_name"] = company_data.get("startup_brand", "Unknown Company")
-            
-            if extracted_data.get("registered_address"):
-                merged_data["registered_address"] = extracted_data["registered_address"]
-            else:
-                # Fallback: Set a default placeholder if no address extracted
-                merged_data["registered_address"] = "Address to be updated"
-            
             # Create company record
-            company = PortfolioCompany(**merged_data)
+            company = PortfolioCompany(**self._merge_company_data(company_data, extracted_data))
             
             self.db.add(company)
             self.db.flush()
@@ -295,6 +323,20 @@ class PortfolioDocumentProcessor:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create company record: {str(e)}")
     
+    def _bulk_insert_founders(self, founder_records: List[Dict[str, Any]]) -> List[PortfolioFounder]:
+        """
+        Insert founder rows with one ORM bulk INSERT ... RETURNING statement
+        
+        Args:
+            founder_records: Column values for each founder
+            
+        Returns:
+            List of the inserted PortfolioFounder instances, with IDs and server defaults loaded
+        """
+        if not founder_records:
+            return []
+        return list(self.db.scalars(insert(PortfolioFounder).returning(PortfolioFounder, sort_by_parameter_order=True), founder_records))
+    
     def create_founder_records(
         self,
         company_id: int,
@@ -319,18 +361,14 @@ class PortfolioDocumentProcessor:
             for i, founder_ui_data in enumerate(founders_data):
                 founder_name = extracted_founder_names[i] if i < len(extracted_founder_names) else None
                 
-                founder = PortfolioFounder(
-                    company_id=company_id,
-                    founder_name=founder_name,
-                    founder_email=founder_ui_data["founder_email"],
-                    founder_role=founder_ui_data["founder_role"]
-                )
-                
-                self.db.add(founder)
-                self.db.flush()
-                founder_records.append(founder)
-            
-            return founder_records
+                founder_records.append({
+                    "company_id": company_id,
+                    "founder_name": founder_name,
+                    "founder_email": founder_ui_data["founder_email"],
+                    "founder_role": founder_ui_data["founder_role"]
+                })
+            
+            return self._bulk_insert_founders(founder_records)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create founder records: {str(e)}")
     
@@ -365,18 +403,14 @@ class PortfolioDocumentProcessor:
                     email = founder_info["email"]
                     role = founder_info["role"]
                 
-                founder = PortfolioFounder(
-                    company_id=company_id,
-                    founder_name=founder_name,
-                    founder_email=email,
-                    founder_role=role
-                )
-                
-                self.db.add(founder)
-                self.db.flush()
-                founder_records.append(founder)
-            
-            return founder_records
+                founder_records.append({
+                    "company_id": company_id,
+                    "founder_name": founder_name,
+                    "founder_email": email,
+                    "founder_role": role
+                })
+            
+            return self._bulk_insert_founders(founder_records)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create founder records: {str(e)}")
     
@@ -398,26 +432,34 @@ class PortfolioDocumentProcessor:
             Created PortfolioInvestment instance
         """
         try:
-            # Merge UI data with extracted data
-            merged_data = {**investment_data, "company_id": company_id}
-            
-            # Add extracted SHA sign date
-            if extracted_data.get("sha_sign_date"):
-                merged_data["sha_sign_date"] = extracted_data["sha_sign_date"]
-            
-            # Calculate funding TAT if both dates are available
-            termsheet_date = merged_data.get("termsheet_sign_date")
-            funding_date = merged_data.get("funding_date")
-            
-            if termsheet_date and funding_date:
-                merged_data["funding_tat_days"] = self.calculate_funding_tat(termsheet_date, funding_date)
-            
             # Create investment record
-            investment = PortfolioInvestment(**merged_data)
+            investment = PortfolioInvestment(**self._merge_investment_data(company_id, investment_data, extracted_data))
             
             self.db.add(investment)
             self.db.flush()
             
             return investment
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create investment record: {str(e)}") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Failed to create investment record: {str(e)}")
+    
+    def _merge_investment_data(
+        self,
+        company_id: int,
+        investment_data: Dict[str, Any],
+        extracted_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Merge UI investment data with the SHA sign date and the computed funding TAT"""
+        merged_data = {**investment_data, "company_id": company_id}
+        
+        # Add extracted SHA sign date
+        if extracted_data.get("sha_sign_date"):
+            merged_data["sha_sign_date"] = extracted_data["sha_sign_date"]
+        
+        # Calculate funding TAT if both dates are available
+        termsheet_date = merged_data.get("termsheet_sign_date")
+        funding_date = merged_data.get("funding_date")
+        
+        if termsheet_date and funding_date:
+            merged_data["funding_tat_days"] = self.calculate_funding_tat(termsheet_date, funding_date)
+        
+        return merged_data
@@ -1,188 +1,219 @@
 """
 Excel Generation Service for Unit Allotment Sheets
 """
-import os
 import logging
-from typing import List, Dict, Any
+import re
+from typing import Iterable, List, Dict, Any, Tuple
 from datetime import datetime, date
 from pathlib import Path
-import tempfile
+from io import BytesIO
 from decimal import Decimal
+from operator import attrgetter
 
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 
 from ..models.unit_allotment import UnitAllotment
-from ..utils.s3_storage import S3DocumentStorage
+from ..utils.s3_storage import get_s3_storage
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_FIELDS = attrgetter('allotted_units', 'drawdown_amount', 'mgmt_fees', 'stamp_duty')
+# Characters dropped from fund names in S3 keys: anything but alphanumerics, spaces, hyphens and underscores
+_UNSAFE_NAME_CHARS = re.compile(r'[^\w \-]')
+
 class UnitAllotmentExcelGenerator:
     """
     Service for generating Excel sheets for unit allotments with regulatory compliance formatting.
     """
     
+    # Excel formatting constants; openpyxl style objects are immutable, so one shared set
+    # serves every instance instead of being rebuilt per request
+    HEADER_FONT = Font(name='Arial', size=11, bold=True, color='FFFFFF')
+    HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+    DATA_FONT = Font(name='Arial', size=10)
+    BORDER = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+    RIGHT_ALIGNMENT = Alignment(horizontal='right', vertical='center')
+    
     def __init__(self):
-        self.s3_storage = S3DocumentStorage()
-        
-        # Excel formatting constants
-        self.HEADER_FONT = Font(name='Arial', size=11, bold=True, color='FFFFFF')
-        self.HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        self.DATA_FONT = Font(name='Arial', size=10)
-        self.BORDER = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        self.CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
-        self.RIGHT_ALIGNMENT = Alignment(horizontal='right', vertical='center')
+        self.s3_storage = get_s3_storage()
     
     def generate_allotment_sheet(self, 
-                                 allotments: List[UnitAllotment],
+                                 allotments: Iterable[UnitAllotment],
                                  fund_name: str,
                                  drawdown_quarter: str) -> str:
         """
         Generate Excel sheet for unit allotments with regulatory formatting.
         
         Args:
-            allotments: List of UnitAllotment objects
+            allotments: UnitAllotment objects; any iterable works, e.g. query.yield_per(1000),
+                        since each row is streamed to the sheet as it is read
             fund_name: Name of the fund
             drawdown_quarter: Quarter for the drawdown (e.g., "FY25Q1")
             
         Returns:
             str: S3 URL of the generated Excel file
         """
-        if not allotments:
-            raise ValueError("No allotments provided for Excel generation")
+        content, total_lps = self._workbook_to_bytes(allotments)
+        return self._upload_workbook(content, fund_name, drawdown_quarter, total_lps)
+    
+    def _upload_workbook(self, content: bytes, fund_name: str, drawdown_quarter: str, total_lps: int) -> str:
+        """Upload an in-memory allotment workbook to S3 and return its URL."""
+        s3_key = self._generate_s3_key(fund_name, drawdown_quarter)
+        upload_result = self.s3_storage.upload_bytes(
+            content=content,
+            s3_key=s3_key,
+            metadata={
+                'document_type': 'unit_allotment',
+                'fund_name': fund_name,
+                'drawdown_quarter': drawdown_quarter,
+                'total_lps': str(total_lps),
+                'generated_date': datetime.utcnow().isoformat()
+            },
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
         
-        # Create workbook and worksheet
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
-        worksheet.title = "Unit Allotment"
+        logger.info(f"Unit allotment Excel generated and uploaded to S3: {s3_key}")
+        return upload_result['s3_url']
+    
+    def _workbook_to_bytes(self, allotments: Iterable[UnitAllotment]) -> Tuple[bytes, int]:
+        """Write the allotment sheet and return the .xlsx content with the number of LP rows."""
+        # Create a write-only workbook, which streams rows to XML instead of holding a cell grid
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet("Unit Allotment")
+        
+        self._register_styles(workbook)
+        self._apply_formatting(worksheet)
         
         # Set up headers and data
         self._setup_headers(worksheet)
-        self._populate_data(worksheet, allotments)
-        self._apply_formatting(worksheet, len(allotments))
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(
-            suffix='.xlsx', 
-            delete=False, 
-            prefix=f'unit_allotment_{drawdown_quarter}_'
-        ) as temp_file:
-            workbook.save(temp_file.name)
-            temp_file_path = temp_file.name
+        total_lps = self._populate_data(worksheet, allotments)
+        if not total_lps:
+            # Release the sheet's temporary file, since the workbook is never saved
+            worksheet.close()
+            raise ValueError("No allotments provided for Excel generation")
         
-        try:
-            # Upload to S3
-            s3_key = self._generate_s3_key(fund_name, drawdown_quarter)
-            upload_result = self.s3_storage.upload_file(
-                local_file_path=temp_file_path,
-                s3_key=s3_key,
-                metadata={
-                    'document_type': 'unit_allotment',
-                    'fund_name': fund_name,
-                    'drawdown_quarter': drawdown_quarter,
-                    'total_lps': str(len(allotments)),
-                    'generated_date': datetime.utcnow().isoformat()
-                },
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            
-            logger.info(f"Unit allotment Excel generated and uploaded to S3: {s3_key}")
-            return upload_result['s3_url']
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                logger.warning(f"Could not delete temporary file: {temp_file_path}")
+        # Save in memory; the sheet goes straight to S3 without a temp file on disk
+        buffer = BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue(), total_lps
+    
+    # Headers in the exact order from the provided template
+    HEADERS = (
+        'FIRST-HOLDER-NAME', 'FIRST-HOLDER-PAN', 'SECOND-HOLDER-NAME', 'SECOND-HOLDER-PAN',
+        'THIRD-HOLDER-NAME', 'THIRD-HOLDER-PAN', 'Depository', 'DPID', 'CLID',
+        'ALLOTED UNIT', 'NAV/F. VALUE', 'DATE OF ALLOTMENT', 'COMMITTED AMT',
+        'DRAWDOWN AMOUNT', 'MGMT FEES', 'AMT ACCEPTED', 'BANK ACCOUNT NO', 'BANK NAME',
+        'MICR CODE', 'IFSC CODE', 'STAMP DUTY', 'STATUS', 'DRAWDOWN DATE', 
+        'DRAWDOWN QUARTER', 'NOTIFICATION', 'FLAG'
+    )
+    
+    # Named style for each column, fixed by position in the template:
+    # COMMITTED AMT, DRAWDOWN AMOUNT, MGMT FEES, AMT ACCEPTED and STAMP DUTY are amounts,
+    # ALLOTED UNIT and NAV/F. VALUE are integer unit columns
+    COLUMN_STYLES = tuple(
+        'allotment_amount' if col_num in (13, 14, 15, 16, 21)
+        else 'allotment_units' if col_num in (10, 11)
+        else 'allotment_text'
+        for col_num in range(1, len(HEADERS) + 1)
+    )
+    
+    # Expected maximum data width per column, in header order: names and bank names 30,
+    # PAN 10, CDSL client IDs 16, amounts and account numbers 18, dates 10
+    COL_MAX_DATA_WIDTH = (
+        30, 10, 30, 10, 30, 10, 10, 10, 16,
+        12, 10, 10, 18,
+        18, 18, 18, 18, 30,
+        9, 11, 18, 20, 10,
+        8, 0, 0
+    )
+    
+    def _register_styles(self, workbook):
+        """
+        Register the sheet's cell styles once per workbook. Assigning a named style sets a
+        cell's font, fill, border, alignment and number format in one step, instead of
+        interning each style object separately for every cell.
+        """
+        styles = [
+            NamedStyle(name='allotment_header', font=self.HEADER_FONT, fill=self.HEADER_FILL,
+                       border=self.BORDER, alignment=self.CENTER_ALIGNMENT),
+            NamedStyle(name='allotment_text', font=self.DATA_FONT, border=self.BORDER,
+                       alignment=self.CENTER_ALIGNMENT),
+            NamedStyle(name='allotment_amount', font=self.DATA_FONT, border=self.BORDER,
+                       alignment=self.RIGHT_ALIGNMENT, number_format='#,##0.00'),
+            NamedStyle(name='allotment_units', font=self.DATA_FONT, border=self.BORDER,
+                       alignment=self.RIGHT_ALIGNMENT, number_format='#,##0'),
+        ]
+        for style in styles:
+            workbook.add_named_style(style)
     
     def _setup_headers(self, worksheet):
-        """Set up Excel headers based on the exact order from the provided template."""
-        headers = [
-            'FIRST-HOLDER-NAME', 'FIRST-HOLDER-PAN', 'SECOND-HOLDER-NAME', 'SECOND-HOLDER-PAN',
-            'THIRD-HOLDER-NAME', 'THIRD-HOLDER-PAN', 'Depository', 'DPID', 'CLID',
-            'ALLOTED UNIT', 'NAV/F. VALUE', 'DATE OF ALLOTMENT', 'COMMITTED AMT',
-            'DRAWDOWN AMOUNT', 'MGMT FEES', 'AMT ACCEPTED', 'BANK ACCOUNT NO', 'BANK NAME',
-            'MICR CODE', 'IFSC CODE', 'STAMP DUTY', 'STATUS', 'DRAWDOWN DATE', 
-            'DRAWDOWN QUARTER', 'NOTIFICATION', 'FLAG'
+        """Write the header row based on the exact order from the provided template."""
+        header_row = []
+        for header in self.HEADERS:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.style = 'allotment_header'
+            header_row.append(cell)
+        worksheet.append(header_row)
+    
+    def _build_data_row(self, allotment: UnitAllotment) -> List[Any]:
+        """Build one row of allotment data in the exact order from the template."""
+        return [
+            allotment.first_holder_name,  # FIRST-HOLDER-NAME
+            allotment.first_holder_pan or '',  # FIRST-HOLDER-PAN
+            allotment.second_holder_name or '',  # SECOND-HOLDER-NAME
+            allotment.second_holder_pan or '',  # SECOND-HOLDER-PAN
+            allotment.third_holder_name or '',  # THIRD-HOLDER-NAME
+            allotment.third_holder_pan or '',  # THIRD-HOLDER-PAN
+            allotment.depository or '',  # Depository
+            allotment.dpid or '',  # DPID
+            allotment.clid or '',  # CLID
+            allotment.allotted_units,  # ALLOTED UNIT
+            allotment.nav_value,  # NAV/F. VALUE (now integer)
+            allotment.date_of_allotment.strftime('%d/%m/%Y') if allotment.date_of_allotment else '',  # DATE OF ALLOTMENT
+            allotment.committed_amt,  # COMMITTED AMT
+            allotment.drawdown_amount,  # DRAWDOWN AMOUNT
+            allotment.mgmt_fees,  # MGMT FEES
+            allotment.amt_accepted,  # AMT ACCEPTED
+            allotment.bank_account_no or '',  # BANK ACCOUNT NO
+            allotment.bank_account_name or '',  # BANK NAME
+            allotment.micr_code or '',  # MICR CODE
+            allotment.bank_ifsc or '',  # IFSC CODE
+            allotment.stamp_duty,  # STAMP DUTY
+            allotment.status,  # STATUS
+            allotment.drawdown_date.strftime('%d/%m/%Y') if allotment.drawdown_date else '',  # DRAWDOWN DATE
+            allotment.drawdown_quarter,  # DRAWDOWN QUARTER
+            '',  # NOTIFICATION (empty)
+            ''   # FLAG (empty)
         ]
-        
-        # Write headers
-        for col_num, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = self.HEADER_FONT
-            cell.fill = self.HEADER_FILL
-            cell.alignment = self.CENTER_ALIGNMENT
-            cell.border = self.BORDER
     
-    def _populate_data(self, worksheet, allotments: List[UnitAllotment]):
-        """Populate worksheet with allotment data in the exact order from the template."""
-        for row_num, allotment in enumerate(allotments, 2):  # Start from row 2
-            data_row = [
-                allotment.first_holder_name,  # FIRST-HOLDER-NAME
-                allotment.first_holder_pan or '',  # FIRST-HOLDER-PAN
-                allotment.second_holder_name or '',  # SECOND-HOLDER-NAME
-                allotment.second_holder_pan or '',  # SECOND-HOLDER-PAN
-                allotment.third_holder_name or '',  # THIRD-HOLDER-NAME
-                allotment.third_holder_pan or '',  # THIRD-HOLDER-PAN
-                allotment.depository or '',  # Depository
-                allotment.dpid or '',  # DPID
-                allotment.clid or '',  # CLID
-                allotment.allotted_units,  # ALLOTED UNIT
-                allotment.nav_value,  # NAV/F. VALUE (now integer)
-                allotment.date_of_allotment.strftime('%d/%m/%Y') if allotment.date_of_allotment else '',  # DATE OF ALLOTMENT
-                float(allotment.committed_amt),  # COMMITTED AMT
-                float(allotment.drawdown_amount),  # DRAWDOWN AMOUNT
-                float(allotment.mgmt_fees),  # MGMT FEES
-                float(allotment.amt_accepted),  # AMT ACCEPTED
-                allotment.bank_account_no or '',  # BANK ACCOUNT NO
-                allotment.bank_account_name or '',  # BANK NAME
-                allotment.micr_code or '',  # MICR CODE
-                allotment.bank_ifsc or '',  # IFSC CODE
-                float(allotment.stamp_duty),  # STAMP DUTY
-                allotment.status,  # STATUS
-                allotment.drawdown_date.strftime('%d/%m/%Y') if allotment.drawdown_date else '',  # DRAWDOWN DATE
-                allotment.drawdown_quarter,  # DRAWDOWN QUARTER
-                '',  # NOTIFICATION (empty)
-                ''   # FLAG (empty)
-            ]
-            
-            for col_num, value in enumerate(data_row, 1):
-                cell = worksheet.cell(row=row_num, column=col_num)
-                cell.value = value
-                cell.font = self.DATA_FONT
-                cell.border = self.BORDER
-                
-                # Apply specific formatting based on data type and new column positions
-                if isinstance(value, float) and col_num in [13, 14, 15, 16, 21]:  # Financial columns: COMMITTED AMT, DRAWDOWN AMOUNT, MGMT FEES, AMT ACCEPTED, STAMP DUTY
-                    cell.number_format = '#,##0.00'
-                    cell.alignment = self.RIGHT_ALIGNMENT
-                elif col_num in [10, 11]:  # Unit columns (integers): ALLOTED UNIT, NAV/F. VALUE
-                    cell.number_format = '#,##0'
-                    cell.alignment = self.RIGHT_ALIGNMENT
-                else:
-                    cell.alignment = self.CENTER_ALIGNMENT
+    def _populate_data(self, worksheet, allotments: Iterable[UnitAllotment]) -> int:
+        """Stream allotment data rows to the worksheet and return how many were written."""
+        row_count = 0
+        for allotment in allotments:
+            row = []
+            for value, style in zip(self._build_data_row(allotment), self.COLUMN_STYLES):
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.style = style
+                row.append(cell)
+            worksheet.append(row)
+            row_count += 1
+        return row_count
     
-    def _apply_formatting(self, worksheet, data_rows: int):
-        """Apply final formatting to the worksheet."""
-        # Auto-adjust column widths with better handling for long column names
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+    def _apply_formatting(self, worksheet):
+        """Apply sheet-level formatting; must run before any row is written."""
+        # Size columns from the header and the expected data width, without scanning the data
+        for col_num, (header, max_data_width) in enumerate(zip(self.HEADERS, self.COL_MAX_DATA_WIDTH), 1):
+            column_letter = get_column_letter(col_num)
+            max_length = max(len(header), max_data_width)
             
             # Enhanced width calculation for better readability
             if max_length > 10:  # For longer column names, add more buffer
@@ -207,7 +238,7 @@ class UnitAllotmentExcelGenerator:
     def _generate_s3_key(self, fund_name: str, drawdown_quarter: str) -> str:
         """Generate S3 key for the allotment sheet."""
         # Clean fund name for file path
-        safe_fund_name = "".join(c for c in fund_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_fund_name = _UNSAFE_NAME_CHARS.sub('', fund_name).strip()
         safe_fund_name = safe_fund_name.replace(' ', '_')
         
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
@@ -230,6 +261,43 @@ class UnitAllotmentExcelGenerator:
         # For now, we'll create a simple single-LP Excel sheet
         return self.generate_allotment_sheet([allotment], fund_name, allotment.drawdown_quarter)
     
+    def generate_allotment_sheet_with_report(self,
+                                             allotments: Iterable[UnitAllotment],
+                                             fund_name: str,
+                                             drawdown_quarter: str) -> Dict[str, Any]:
+        """
+        Generate the allotment sheet, validating and summarizing the allotments in the
+        same pass that writes their rows. Use this instead of calling
+        validate_allotment_data, get_allotment_summary and generate_allotment_sheet
+        one after another, which reads every allotment three times (and cannot work
+        with a one-shot iterable such as query.yield_per).
+        
+        Args:
+            allotments: UnitAllotment objects; any iterable works
+            fund_name: Name of the fund
+            drawdown_quarter: Quarter for the drawdown (e.g., "FY25Q1")
+            
+        Returns:
+            Dict[str, Any]: S3 URL of the sheet ('s3_url'), summary statistics ('summary')
+                            and validation errors by category ('validation_errors')
+        """
+        errors = self._new_validation_errors()
+        totals = self._new_summary_totals()
+        
+        def observed_allotments():
+            for allotment in allotments:
+                self._accumulate_summary(totals, allotment)
+                self._validate_one(allotment, totals['total_lps'], errors)
+                yield allotment
+        
+        s3_url = self.generate_allotment_sheet(observed_allotments(), fund_name, drawdown_quarter)
+        
+        return {
+            's3_url': s3_url,
+            'summary': self._summary_from_totals(totals),
+            'validation_errors': {k: v for k, v in errors.items() if v}
+        }
+    
     def validate_allotment_data(self, allotments: List[UnitAllotment]) -> Dict[str, List[str]]:
         """
         Validate allotment data before Excel generation.
@@ -240,35 +308,43 @@ class UnitAllotmentExcelGenerator:
         Returns:
             Dict[str, List[str]]: Dictionary of validation errors by category
         """
-        errors = {
+        errors = self._new_validation_errors()
+        
+        for i, allotment in enumerate(allotments, 1):
+            self._validate_one(allotment, i, errors)
+        
+        # Remove empty error categories
+        return {k: v for k, v in errors.items() if v}
+    
+    @staticmethod
+    def _new_validation_errors() -> Dict[str, List[str]]:
+        return {
             'missing_required_fields': [],
             'invalid_calculations': [],
             'data_inconsistencies': []
         }
+    
+    def _validate_one(self, allotment: UnitAllotment, lp_number: int, errors: Dict[str, List[str]]):
+        """Append the validation errors for one allotment (the lp_number-th, from 1) to errors."""
+        lp_identifier = f"LP {lp_number} ({allotment.first_holder_name})"
         
-        for i, allotment in enumerate(allotments):
-            lp_identifier = f"LP {i+1} ({allotment.first_holder_name})"
-            
-            # Check required fields
-            if not allotment.first_holder_name:
-                errors['missing_required_fields'].append(f"{lp_identifier}: Missing LP name")
-            
-            if not allotment.drawdown_amount or allotment.drawdown_amount <= 0:
-                errors['missing_required_fields'].append(f"{lp_identifier}: Invalid drawdown amount")
-            
-            if not allotment.allotted_units or allotment.allotted_units <= 0:
-                errors['invalid_calculations'].append(f"{lp_identifier}: Invalid unit allocation")
-            
-            # Validate calculations
-            if allotment.nav_value and allotment.drawdown_amount:
-                expected_units = int(allotment.drawdown_amount / allotment.nav_value)
-                if abs(allotment.allotted_units - expected_units) > 1:  # Allow for rounding differences
-                    errors['invalid_calculations'].append(
-                        f"{lp_identifier}: Unit calculation mismatch (expected ~{expected_units}, got {allotment.allotted_units})"
-                    )
+        # Check required fields
+        if not allotment.first_holder_name:
+            errors['missing_required_fields'].append(f"{lp_identifier}: Missing LP name")
         
-        # Remove empty error categories
-        return {k: v for k, v in errors.items() if v}
+        if not allotment.drawdown_amount or allotment.drawdown_amount <= 0:
+            errors['missing_required_fields'].append(f"{lp_identifier}: Invalid drawdown amount")
+        
+        if not allotment.allotted_units or allotment.allotted_units <= 0:
+            errors['invalid_calculations'].append(f"{lp_identifier}: Invalid unit allocation")
+        
+        # Validate calculations
+        if allotment.nav_value and allotment.drawdown_amount:
+            expected_units = int(allotment.drawdown_amount / allotment.nav_value)
+            if abs(allotment.allotted_units - expected_units) > 1:  # Allow for rounding differences
+                errors['invalid_calculations'].append(
+                    f"{lp_identifier}: Unit calculation mismatch (expected ~{expected_units}, got {allotment.allotted_units})"
+                )
     
     def get_allotment_summary(self, allotments: List[UnitAllotment]) -> Dict[str, Any]:
         """
@@ -280,20 +356,44 @@ class UnitAllotmentExcelGenerator:
         Returns:
             Dict[str, Any]: Summary statistics
         """
-        if not allotments:
+        totals = self._new_summary_totals()
+        for allotment in allotments:
+            self._accumulate_summary(totals, allotment)
+        return self._summary_from_totals(totals)
+    
+    @staticmethod
+    def _new_summary_totals() -> Dict[str, Any]:
+        return {
+            'total_lps': 0,
+            'total_units': 0,
+            'total_amount': Decimal('0'),
+            'total_mgmt_fees': Decimal('0'),
+            'total_stamp_duty': Decimal('0'),
+            'drawdown_quarter': None
+        }
+    
+    def _accumulate_summary(self, totals: Dict[str, Any], allotment: UnitAllotment):
+        """Add one allotment to the running summary totals."""
+        units, amount, mgmt_fees, stamp_duty = _SUMMARY_FIELDS(allotment)
+        if not totals['total_lps']:
+            totals['drawdown_quarter'] = allotment.drawdown_quarter
+        totals['total_lps'] += 1
+        totals['total_units'] += units
+        totals['total_amount'] += amount
+        totals['total_mgmt_fees'] += mgmt_fees
+        totals['total_stamp_duty'] += stamp_duty
+    
+    def _summary_from_totals(self, totals: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the summary statistics from accumulated totals; empty if no allotments."""
+        if not totals['total_lps']:
             return {}
         
-        total_units = sum(a.allotted_units for a in allotments)
-        total_amount = sum(a.drawdown_amount for a in allotments)
-        total_mgmt_fees = sum(a.mgmt_fees for a in allotments)
-        total_stamp_duty = sum(a.stamp_duty for a in allotments)
-        
         return {
-            'total_lps': len(allotments),
-            'total_units_allocated': total_units,
-            'total_amount_allocated': float(total_amount),
-            'total_management_fees': float(total_mgmt_fees),
-            'total_stamp_duty': float(total_stamp_duty),
-            'drawdown_quarter': allotments[0].drawdown_quarter,
+            'total_lps': totals['total_lps'],
+            'total_units_allocated': totals['total_units'],
+            'total_amount_allocated': float(totals['total_amount']),
+            'total_management_fees': float(totals['total_mgmt_fees']),
+            'total_stamp_duty': float(totals['total_stamp_duty']),
+            'drawdown_quarter': totals['drawdown_quarter'],
             'generation_date': datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
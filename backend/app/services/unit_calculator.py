@@ -1,11 +1,23 @@
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence, Tuple
 from datetime import date
+from functools import lru_cache
 import math
 
 # Import the quarter calculation function from drawdowns module
 from ..api.drawdowns import calculate_quarter_string
 
+@lru_cache(maxsize=256)
+def _quarter_cached(drawdown_date: date) -> str:
+    # Many LPs share a drawdown date, so the quarter string is computed once per date
+    return calculate_quarter_string(drawdown_date)
+
+def _to_decimal(value: Any) -> Decimal:
+    # Values that are already Decimal (the usual case for DB amounts) are used as-is
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
 class UnitCalculationEngine:
     """
     Service for calculating unit allocations, management fees, and stamp duties
@@ -91,7 +103,7 @@ class UnitCalculationEngine:
         Returns:
             str: Formatted quarter string (e.g., "Q1'25")
         """
-        return calculate_quarter_string(drawdown_date)
+        return _quarter_cached(drawdown_date)
     
     def validate_calculation_inputs(self, calculation_data: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -103,6 +115,22 @@ class UnitCalculationEngine:
         Returns:
             Dict[str, str]: Dictionary of validation errors (empty if all valid)
         """
+        _, errors = self.validate_and_coerce(calculation_data)
+        return errors
+    
+    def validate_and_coerce(self, calculation_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Validate all input data for unit allocation calculations and convert the
+        numeric fields to the types the calculations use.
+        
+        Args:
+            calculation_data: Dictionary containing all calculation inputs
+            
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, str]]: The coerced inputs (amounts and rates
+                as Decimal, nav_value as int) and the validation errors (empty if all valid)
+        """
+        coerced = dict(calculation_data)
         errors = {}
         
         # Required fields validation
@@ -118,7 +146,8 @@ class UnitCalculationEngine:
         # Numeric validations
         if 'drawdown_amount' in calculation_data:
             try:
-                amount = Decimal(str(calculation_data['drawdown_amount']))
+                amount = _to_decimal(calculation_data['drawdown_amount'])
+                coerced['drawdown_amount'] = amount
                 if amount <= 0:
                     errors['drawdown_amount'] = "Drawdown amount must be greater than 0"
             except (ValueError, TypeError):
@@ -127,6 +156,7 @@ class UnitCalculationEngine:
         if 'nav_value' in calculation_data:
             try:
                 nav = int(calculation_data['nav_value'])
+                coerced['nav_value'] = nav
                 if nav <= 0:
                     errors['nav_value'] = "NAV value must be greater than 0"
             except (ValueError, TypeError):
@@ -134,7 +164,8 @@ class UnitCalculationEngine:
         
         if 'commitment_amount' in calculation_data:
             try:
-                commitment = Decimal(str(calculation_data['commitment_amount']))
+                commitment = _to_decimal(calculation_data['commitment_amount'])
+                coerced['commitment_amount'] = commitment
                 if commitment <= 0:
                     errors['commitment_amount'] = "Commitment amount must be greater than 0"
             except (ValueError, TypeError):
@@ -142,7 +173,8 @@ class UnitCalculationEngine:
         
         if 'mgmt_fee_rate' in calculation_data:
             try:
-                rate = Decimal(str(calculation_data['mgmt_fee_rate']))
+                rate = _to_decimal(calculation_data['mgmt_fee_rate'])
+                coerced['mgmt_fee_rate'] = rate
                 if rate < 0:
                     errors['mgmt_fee_rate'] = "Management fee rate cannot be negative"
                 if rate > 1:
@@ -152,7 +184,8 @@ class UnitCalculationEngine:
         
         if 'stamp_duty_rate' in calculation_data:
             try:
-                rate = Decimal(str(calculation_data['stamp_duty_rate']))
+                rate = _to_decimal(calculation_data['stamp_duty_rate'])
+                coerced['stamp_duty_rate'] = rate
                 if rate < 0:
                     errors['stamp_duty_rate'] = "Stamp duty rate cannot be negative"
                 if rate > 1:
@@ -160,7 +193,7 @@ class UnitCalculationEngine:
             except (ValueError, TypeError):
                 errors['stamp_duty_rate'] = "Stamp duty rate must be a valid number"
         
-        return errors
+        return coerced, errors
     
     def calculate_all_for_drawdown(self, 
                                    drawdown_amount: Decimal,
@@ -193,14 +226,14 @@ class UnitCalculationEngine:
             'drawdown_date': drawdown_date
         }
         
-        validation_errors = self.validate_calculation_inputs(calculation_data)
+        inputs, validation_errors = self.validate_and_coerce(calculation_data)
         if validation_errors:
             raise ValueError(f"Validation errors: {validation_errors}")
         
-        # Perform calculations
-        units = self.calculate_units(drawdown_amount, nav_value)
-        mgmt_fees = self.calculate_management_fees(commitment_amount, mgmt_fee_rate)
-        stamp_duty = self.calculate_stamp_duty(drawdown_amount, stamp_duty_rate)
+        # Perform calculations on the values already converted during validation
+        units = self.calculate_units(inputs['drawdown_amount'], inputs['nav_value'])
+        mgmt_fees = self.calculate_management_fees(inputs['commitment_amount'], inputs['mgmt_fee_rate'])
+        stamp_duty = self.calculate_stamp_duty(inputs['drawdown_amount'], inputs['stamp_duty_rate'])
         quarter = self.calculate_drawdown_quarter(drawdown_date)
         
         return {
@@ -208,8 +241,77 @@ class UnitCalculationEngine:
             'mgmt_fees': mgmt_fees,
             'stamp_duty': stamp_duty,
             'drawdown_quarter': quarter,
+            'nav_value': inputs['nav_value'],
+            'drawdown_amount': inputs['drawdown_amount'],
+            'committed_amt': inputs['commitment_amount'],
+            'amt_accepted': inputs['drawdown_amount']  # Assuming full acceptance for now
+        }
+    
+    def calculate_all_batch(self,
+                            drawdowns: Sequence[Tuple[Decimal, Decimal, date]],
+                            nav_value: int,
+                            mgmt_fee_rate: Decimal,
+                            stamp_duty_rate: Decimal) -> List[Dict[str, Any]]:
+        """
+        Calculate all values for every LP drawdown of one fund in one operation.
+        Gives the same results as calling calculate_all_for_drawdown per LP, but the
+        fund-level inputs are validated once and the fee multiplier is computed once,
+        instead of per LP.
+        
+        Args:
+            drawdowns: (drawdown_amount, commitment_amount, drawdown_date) for each LP
+            nav_value: Net Asset Value per unit (integer, typically 100)
+            mgmt_fee_rate: Management fee rate
+            stamp_duty_rate: Stamp duty rate from fund details
+            
+        Returns:
+            List[Dict[str, Any]]: Calculated values for each drawdown, in input order,
+                                  as returned by calculate_all_for_drawdown
+        """
+        # Validate the fund-level inputs once, with a placeholder for the per-LP fields
+        fund_inputs, validation_errors = self.validate_and_coerce({
+            'drawdown_amount': Decimal('1'),
             'nav_value': nav_value,
-            'drawdown_amount': drawdown_amount,
-            'committed_amt': commitment_amount,
-            'amt_accepted': drawdown_amount  # Assuming full acceptance for now
-        }
\ No newline at end of file
+            'commitment_amount': Decimal('1'),
+            'mgmt_fee_rate': mgmt_fee_rate,
+            'stamp_duty_rate': stamp_duty_rate,
+            'drawdown_date': date.min
+        })
+        if validation_errors:
+            raise ValueError(f"Validation errors: {validation_errors}")
+        
+        nav_value = fund_inputs['nav_value']
+        stamp_duty_rate = fund_inputs['stamp_duty_rate']
+        nav = Decimal(nav_value)
+        mgmt_fee_multiplier = fund_inputs['mgmt_fee_rate'] * (Decimal('1') + self.GST_RATE)
+        cent = Decimal('0.01')
+        
+        results = []
+        for position, (drawdown_amount, commitment_amount, drawdown_date) in enumerate(drawdowns, 1):
+            # Per-LP inputs, checked as in validate_calculation_inputs
+            validation_errors = {}
+            if drawdown_amount is None or drawdown_amount <= 0:
+                validation_errors['drawdown_amount'] = "Drawdown amount must be greater than 0"
+            if commitment_amount is None or commitment_amount <= 0:
+                validation_errors['commitment_amount'] = "Commitment amount must be greater than 0"
+            if drawdown_date is None:
+                validation_errors['drawdown_date'] = "drawdown_date is required"
+            if validation_errors:
+                raise ValueError(f"Validation errors for drawdown {position}: {validation_errors}")
+            
+            results.append({
+                'allotted_units': drawdown_amount / nav,
+                'mgmt_fees': (commitment_amount * mgmt_fee_multiplier).quantize(cent, rounding=ROUND_HALF_UP),
+                'stamp_duty': (drawdown_amount * stamp_duty_rate).quantize(cent, rounding=ROUND_HALF_UP),
+                'drawdown_quarter': self.calculate_drawdown_quarter(drawdown_date),
+                'nav_value': nav_value,
+                'drawdown_amount': drawdown_amount,
+                'committed_amt': commitment_amount,
+                'amt_accepted': drawdown_amount  # Assuming full acceptance for now
+            })
+        
+        return results
+
+
+# The engine holds no per-call state, so callers can share one instance
+default_engine = UnitCalculationEngine()
@@ -1,8 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.audit_log import AuditLog
 from typing import Optional, Dict, Any
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+def _parse_user_id(user_id: Optional[uuid.UUID]) -> Optional[uuid.UUID]:
+    """Ensure user_id is either None or a proper UUID object"""
+    if user_id is None or isinstance(user_id, uuid.UUID):
+        return user_id
+    try:
+        return uuid.UUID(str(user_id))
+    except ValueError:
+        logger.warning("Invalid audit log user_id: %s", user_id)
+        return None
+
 def log_activity(
     db: Session,
     activity: str,
@@ -19,32 +32,20 @@ def log_activity(
         details: Additional details about the activity (JSON or text)
     
     Returns:
-        The created AuditLog instance
+        The created AuditLog instance (its attributes reload on first access after the commit)
     """
     try:
-        # Ensure user_id is either None or a proper UUID object
-        parsed_user_id = None
-        if user_id is not None:
-            if isinstance(user_id, str):
-                try:
-                    parsed_user_id = uuid.UUID(user_id)
-                except ValueError:
-                    print(f"Warning: Invalid UUID string: {user_id}")
-            else:
-                parsed_user_id = user_id
-                
         audit_log = AuditLog(
-            user_id=parsed_user_id,
+            user_id=_parse_user_id(user_id),
             activity=activity,
             details=details
         )
         
         db.add(audit_log)
         db.commit()
-        db.refresh(audit_log)
         return audit_log
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error logging activity: {str(e)}")
+        logger.exception("Error logging activity %s", activity)
         # Return None instead of raising an exception to prevent disrupting main functions
         return None
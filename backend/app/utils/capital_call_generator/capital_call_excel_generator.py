@@ -2,16 +2,105 @@
 Capital Call Notice Generator - Excel Version using openpyxl
 """
 import os
+import re
 from pathlib import Path
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 # from openpyxl.drawing import image  # Commented out for now
 from datetime import datetime
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Anything outside this set (spaces, path separators, NUL, ...) is replaced in generated filenames
+_SAFE_RE = re.compile(r'[^A-Za-z0-9_-]+')
+
+# Notice text, filled per investor with str.format_map
+_INTRO_MESSAGES = (
+    "Dear {investor},",
+    "",
+    "Thank you for being AJVC's first supporters as we begin this journey. We are grateful for",
+    "your support from Day 1.",
+    "",
+    "We are writing to notify you, as per the Contribution Agreement entered with AJVC Fund.",
+    "",
+    "The Fund is calling capital from you in the amount of INR {amount_due:,} - which is",
+    "{commitment_pct:.0f}% of your committed capital.",
+    "",
+    "Contribution is due on or before {contribution_due_date} and must be wired in immediately.",
+    "",
+    "The wire instructions are as follows:"
+)
+_FINAL_MESSAGES = (
+    "Please instruct the financial institution ({bank_name}) handling the wire",
+    "transfer to include your name, as a Limited Partner of the Fund.",
+    "",
+    "We plan to do quarterly drawdowns at the beginning of each quarter.",
+    "Forecasted next quarter ({forecast_next_quarter_period}) drawdown: {forecast_next_quarter:.0f}% of the committed amount."
+)
+
+# Styles shared by every generated notice; openpyxl style objects are immutable
+_LOGO_FONT = Font(name='Arial', size=16, bold=True, color='FF0000')
+_TITLE_FONT = Font(name='Arial', size=24, bold=True, color='FF0000')
+_HEADER_FONT = Font(name='Arial', size=12, bold=True)
+_NORMAL_FONT = Font(name='Arial', size=11)
+_LEFT_ALIGNMENT = Alignment(horizontal='left')
+_THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+class _NoticeLayout:
+    """
+    Row -> column -> cell map for a write-only sheet, which must know its column widths
+    before the first row is streamed. The longest value per column is tracked as cells
+    are placed, so widths need no second pass over the cells.
+    """
+    
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows: Dict[int, Dict[int, WriteOnlyCell]] = {}
+        self.max_length: Dict[int, int] = {}
+    
+    def put(self, row: int, column: int, value: Any, font: Font,
+            border: Optional[Border] = None, alignment: Optional[Alignment] = None):
+        """Place a styled cell at (row, column)."""
+        cell = WriteOnlyCell(self.ws, value=value)
+        cell.font = font
+        if border is not None:
+            cell.border = border
+        if alignment is not None:
+            cell.alignment = alignment
+        self.rows.setdefault(row, {})[column] = cell
+        length = len(str(value)) if value else 0
+        if length > self.max_length.get(column, 0):
+            self.max_length[column] = length
+    
+    def write_messages(self, current_row: int, messages: List[str]) -> int:
+        """Write message lines down column A, skipping blank lines; return the next free row."""
+        for message in messages:
+            if message:
+                self.put(current_row, 1, message, _NORMAL_FONT)
+            current_row += 1
+        return current_row
+    
+    def stream(self):
+        """Set column widths, then stream every row to the worksheet in order."""
+        # Merged ranges count towards the sheet's columns, as in a regular worksheet
+        max_column = max([*self.max_length, *(merged.max_col for merged in self.ws.merged_cells.ranges)])
+        for column in range(1, max_column + 1):
+            self.ws.column_dimensions[get_column_letter(column)].width = min(self.max_length.get(column, 0) + 2, 50)
+        
+        for row in range(1, max(self.rows) + 1):
+            row_cells = self.rows.get(row, {})
+            self.ws.append([row_cells.get(column) for column in range(1, max_column + 1)])
+
+
 class CapitalCallExcelGenerator:
     def __init__(self, output_dir: str = "uploads/capital_calls"):
         """
@@ -36,62 +125,49 @@ class CapitalCallExcelGenerator:
         """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"capital_call_{data.get('investor', 'unknown').replace(' ', '_')}_{timestamp}.xlsx"
+            investor_slug = _SAFE_RE.sub('_', str(data.get('investor', 'unknown')))
+            filename = f"capital_call_{investor_slug}_{timestamp}.xlsx"
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Capital Call"
+        # Write-only workbook: the notice is laid out in a small row -> column -> cell map,
+        # then streamed row by row instead of being held as a full cell grid
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Capital Call")
+        layout = _NoticeLayout(ws)
         
-        # Define styles
-        title_font = Font(name='Arial', size=24, bold=True, color='FF0000')
-        header_font = Font(name='Arial', size=12, bold=True)
-        normal_font = Font(name='Arial', size=11)
+        investor = data.get('investor', '')
+        amount_due = data.get('amount_due', 0)
+        # A missing or zero commitment would otherwise divide by zero
+        commitment_pct = amount_due / (data.get('total_commitment') or 1) * 100
         
         # Add AJVC logo placeholder (you can add actual logo later)
-        ws.merge_cells('A2:C3')
-        ws['A2'] = "AJVC"
-        ws['A2'].font = Font(name='Arial', size=16, bold=True, color='FF0000')
+        ws.merged_cells.add('A2:C3')
+        layout.put(2, 1, "AJVC", _LOGO_FONT)
         
         # Title
-        ws['A5'] = "Capital Call"
-        ws['A5'].font = title_font
-        ws.merge_cells('A5:F5')
-        ws['A5'].alignment = Alignment(horizontal='left')
+        layout.put(5, 1, "Capital Call", _TITLE_FONT, alignment=_LEFT_ALIGNMENT)
+        ws.merged_cells.add('A5:F5')
         
         # Notice Date and Investor
-        ws['A7'] = "Notice date"
-        ws['A7'].font = header_font
-        ws['A8'] = data.get('notice_date', '')
-        ws['A8'].font = normal_font
+        layout.put(7, 1, "Notice date", _HEADER_FONT)
+        layout.put(8, 1, data.get('notice_date', ''), _NORMAL_FONT)
         
-        ws['D7'] = "Investor"
-        ws['D7'].font = header_font
-        ws['D8'] = data.get('investor', '')
-        ws['D8'].font = normal_font
+        layout.put(7, 4, "Investor", _HEADER_FONT)
+        layout.put(8, 4, investor, _NORMAL_FONT)
         
         # Personal message
         current_row = 10
-        messages = [
-            f"Dear {data.get('investor', '')},",
-            "",
-            "Thank you for being AJVC's first supporters as we begin this journey. We are grateful for",
-            "your support from Day 1.",
-            "",
-            "We are writing to notify you, as per the Contribution Agreement entered with AJVC Fund.",
-            "",
-            f"The Fund is calling capital from you in the amount of INR {data.get('amount_due', 0):,} - which is",
-            f"{(data.get('amount_due', 0)/data.get('total_commitment', 1)*100):.0f}% of your committed capital.",
-            "",
-            f"Contribution is due on or before {data.get('contribution_due_date', '')} and must be wired in immediately.",
-            "",
-            "The wire instructions are as follows:"
-        ]
-        
-        for message in messages:
-            if message:
-                ws[f'A{current_row}'] = message
-                ws[f'A{current_row}'].font = normal_font
-            current_row += 1
+        message_values = {
+            'investor': investor,
+            'amount_due': amount_due,
+            'commitment_pct': commitment_pct,
+            'contribution_due_date': data.get('contribution_due_date', ''),
+            'bank_name': data.get('bank_name', ''),
+            'forecast_next_quarter_period': data.get('forecast_next_quarter_period', ''),
+            'forecast_next_quarter': data.get('forecast_next_quarter', 0)
+        }
+        messages = [line.format_map(message_values) for line in _INTRO_MESSAGES]
+        
+        current_row = layout.write_messages(current_row, messages)
         
         # Bank details
         bank_details = [
@@ -104,19 +180,15 @@ class CapitalCallExcelGenerator:
         ]
         
         for label, value in bank_details:
-            ws[f'A{current_row}'] = label
-            ws[f'A{current_row}'].font = header_font
-            ws[f'B{current_row}'] = value
-            ws[f'B{current_row}'].font = normal_font
+            layout.put(current_row, 1, label, _HEADER_FONT)
+            layout.put(current_row, 2, value, _NORMAL_FONT)
             current_row += 1
         
         current_row += 1  # Add space
         
-        # Commitment summary table
-        ws[f'A{current_row}'] = "Investor Commitment Summary"
-        ws[f'A{current_row}'].font = header_font
-        ws[f'E{current_row}'] = "Amount"
-        ws[f'E{current_row}'].font = header_font
+        # Commitment summary table, header row bordered like the table rows
+        layout.put(current_row, 1, "Investor Commitment Summary", _HEADER_FONT, border=_THIN_BORDER)
+        layout.put(current_row, 5, "Amount", _HEADER_FONT, border=_THIN_BORDER)
         current_row += 1
         
         # Table data
@@ -124,60 +196,22 @@ class CapitalCallExcelGenerator:
             ("Total commitment", f"₹ {data.get('total_commitment', 0):,}"),
             ("Amount called-up and paid till date", f"₹ {data.get('amount_called_up', 0):,}"),
             ("Remaining commitment after this drawdown", f"₹ {data.get('remaining_commitment', 0):,}"),
-            ("Amount due", f"₹ {data.get('amount_due', 0):,}")
+            ("Amount due", f"₹ {amount_due:,}")
         ]
         
-        # Add borders to table
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        table_start_row = current_row - 1
         for desc, amount in table_data:
-            ws[f'A{current_row}'] = desc
-            ws[f'A{current_row}'].font = normal_font
-            ws[f'A{current_row}'].border = thin_border
-            ws[f'E{current_row}'] = amount
-            ws[f'E{current_row}'].font = normal_font
-            ws[f'E{current_row}'].border = thin_border
+            layout.put(current_row, 1, desc, _NORMAL_FONT, border=_THIN_BORDER)
+            layout.put(current_row, 5, amount, _NORMAL_FONT, border=_THIN_BORDER)
             current_row += 1
         
-        # Add border to header row
-        ws[f'A{table_start_row}'].border = thin_border
-        ws[f'E{table_start_row}'].border = thin_border
-        
         current_row += 1  # Add space
         
         # Final instructions
-        final_messages = [
-            f"Please instruct the financial institution ({data.get('bank_name', '')}) handling the wire",
-            "transfer to include your name, as a Limited Partner of the Fund.",
-            "",
-            "We plan to do quarterly drawdowns at the beginning of each quarter.",
-            f"Forecasted next quarter ({data.get('forecast_next_quarter_period', '')}) drawdown: {data.get('forecast_next_quarter', 0):.0f}% of the committed amount."
-        ]
+        final_messages = [line.format_map(message_values) for line in _FINAL_MESSAGES]
         
-        for message in final_messages:
-            if message:
-                ws[f'A{current_row}'] = message
-                ws[f'A{current_row}'].font = normal_font
-            current_row += 1
+        current_row = layout.write_messages(current_row, final_messages)
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        layout.stream()
         
         # Save the file
         file_path = self.output_dir / filename
@@ -204,4 +238,4 @@ def generate_capital_call_excel(data: Dict[str, Any], output_path: str = None) -
     else:
         filename = None
         
-    return generator.generate_capital_call_excel(data, filename)
\ No newline at end of file
+    return generator.generate_capital_call_excel(data, filename)
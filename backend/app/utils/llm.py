@@ -1,7 +1,7 @@
-from typing import Any
+from typing import Any, Dict, List, Optional
 import os
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv, find_dotenv
 import numpy as np
 import logging
@@ -12,21 +12,27 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-def get_response_from_openai(
-    system_prompt: str, user_prompt: str, model_name: str = "gpt-4.1-mini"
-) -> str:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    response = client.chat.completions.create(
+def _chat_completion_kwargs(
+    system_prompt: str,
+    user_prompt: str,
+    model_name: str,
+    followup_messages: Optional[List[Dict[str, str]]] = None,
+) -> dict:
+    return dict(
         model=model_name,
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
+            *(followup_messages or []),
         ],
         response_format={"type": "json_object"},
         temperature=0,
         logprobs=True,
         seed=0,
     )
+
+
+def _log_and_extract_content(response: Any) -> str:
     log_probs = 0
     for content in response.choices[0].logprobs.content:
         log_probs += content.logprob
@@ -37,3 +43,32 @@ def get_response_from_openai(
     logger.info(f"Response: {response.choices[0].message.content}")
 
     return response.choices[0].message.content
+
+
+def get_response_from_openai(
+    system_prompt: str,
+    user_prompt: str,
+    model_name: str = "gpt-4.1-mini",
+    followup_messages: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """
+    followup_messages are appended after the user prompt, e.g. a previous assistant
+    reply plus a correction request when retrying after a validation failure.
+    """
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    response = client.chat.completions.create(
+        **_chat_completion_kwargs(system_prompt, user_prompt, model_name, followup_messages)
+    )
+    return _log_and_extract_content(response)
+
+
+async def aget_response_from_openai(
+    system_prompt: str, user_prompt: str, model_name: str = "gpt-4.1-mini"
+) -> str:
+    """Async variant of get_response_from_openai, so several LLM calls can be awaited together."""
+    # Close the client's connection pool once the call is done
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        response = await client.chat.completions.create(
+            **_chat_completion_kwargs(system_prompt, user_prompt, model_name)
+        )
+    return _log_and_extract_content(response)
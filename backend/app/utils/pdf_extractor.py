@@ -58,6 +58,7 @@ import re
 import json
 import base64
 import hashlib
+from functools import lru_cache
 from typing import Optional, List, Union, Dict, Any, Tuple
 from pathlib import Path
 from threading import Lock
@@ -68,6 +69,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=256)
+def _file_md5(pdf_path: str, mtime_ns: int, size: int) -> str:
+    """Hash a PDF file; keyed by its mtime and size so an unchanged file is read only once."""
+    with open(pdf_path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
 class MistralOCRManager:
     """
     Singleton manager for Mistral OCR operations with caching and optimization.
@@ -101,13 +109,15 @@ class MistralOCRManager:
             self._client = Mistral(api_key=api_key)
         return self._client
     
-    def get_file_hash(self, pdf_path: str) -> str:
-        """Generate hash for PDF file for caching."""
-        with open(pdf_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+    def get_file_hash(self, pdf_path: Union[str, bytes]) -> str:
+        """Generate hash for PDF file (or in-memory PDF bytes) for caching."""
+        if isinstance(pdf_path, bytes):
+            return hashlib.md5(pdf_path).hexdigest()
+        stat = os.stat(pdf_path)
+        return _file_md5(pdf_path, stat.st_mtime_ns, stat.st_size)
     
-    def encode_pdf_to_base64(self, pdf_path: str) -> str:
-        """Encode PDF to base64 with caching."""
+    def encode_pdf_to_base64(self, pdf_path: Union[str, bytes]) -> str:
+        """Encode PDF (path or in-memory bytes) to base64 with caching."""
         file_hash = self.get_file_hash(pdf_path)
         
         # Check cache first
@@ -115,8 +125,11 @@ class MistralOCRManager:
             return self._encoding_cache[file_hash]
         
         try:
-            with open(pdf_path, "rb") as pdf_file:
-                base64_data = base64.b64encode(pdf_file.read()).decode('utf-8')
+            if isinstance(pdf_path, bytes):
+                base64_data = base64.b64encode(pdf_path).decode('utf-8')
+            else:
+                with open(pdf_path, "rb") as pdf_file:
+                    base64_data = base64.b64encode(pdf_file.read()).decode('utf-8')
                 
             # Cache the base64 data
             self._encoding_cache[file_hash] = base64_data
@@ -129,7 +142,7 @@ class MistralOCRManager:
     
     def process_ocr(
         self, 
-        pdf_path: str, 
+        pdf_path: Union[str, bytes], 
         pages: Optional[List[int]] = None, 
         include_images: bool = False
     ) -> Dict[str, Any]:
@@ -144,6 +157,19 @@ class MistralOCRManager:
         if cache_key in self._result_cache:
             return self._result_cache[cache_key]
         
+        # A page subset of a document already OCR'd in full is sliced from that result
+        # rather than sent to the API a second time
+        if pages is not None:
+            full_result = self._result_cache.get(f"{file_hash}_all_{include_images}")
+            if full_result is not None:
+                wanted = set(pages)
+                result = {
+                    **full_result,
+                    "pages": [p for p in full_result.get("pages", []) if p.get("index") in wanted]
+                }
+                self._result_cache[cache_key] = result
+                return result
+        
         client = self.get_client()
         
         # Encode PDF to base64
@@ -166,7 +192,7 @@ class MistralOCRManager:
         ocr_response = client.ocr.process(**ocr_params)
         
         # Convert to dict and cache
-        result = json.loads(ocr_response.model_dump_json())
+        result = ocr_response.model_dump(mode="json")
         self._result_cache[cache_key] = result
         
         return result
@@ -229,10 +255,11 @@ def _convert_output_format(text: str, output_format: str) -> str:
 
 
 def extract_text_from_pdf(
-    pdf_path: str,
+    pdf_path: Union[str, bytes],
     page_range: Optional[Union[str, List[int]]] = None,
     output_format: str = "markdown",
-    cleanup_after: bool = True
+    cleanup_after: bool = True,
+    include_images: bool = True
 ) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
     """
     Extract text from PDF using Mistral OCR API with direct base64 encoding.
@@ -241,13 +268,15 @@ def extract_text_from_pdf(
     while using Mistral's OCR service with native page range support.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (Union[str, bytes]): Path to the PDF file, or the PDF content itself
         page_range (Optional[Union[str, List[int]]]): Pages to process. Can be:
             - String format: "0,5-10,20" (pages 0, 5-10, and 20)
             - List of integers: [0, 5, 6, 7, 8, 9, 10, 20]
             - None: Process all pages
         output_format (str): Output format - "markdown", "json", or "html"
         cleanup_after (bool): Whether to cleanup cache after processing
+        include_images (bool): Whether OCR should return embedded images' base64 data;
+            text-only callers pass False to keep the OCR response small
     
     Returns:
         Tuple[str, Dict[str, Any], Dict[str, Any]]: (extracted_text, metadata, images)
@@ -262,15 +291,14 @@ def extract_text_from_pdf(
     """
     
     try:
-        # Validate PDF file exists
-        if not os.path.isfile(pdf_path):
+        # Validate PDF file exists (in-memory content needs no check)
+        if not isinstance(pdf_path, bytes) and not os.path.isfile(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         # Convert page range to list format for API
         pages_list = _convert_page_range_to_list(page_range)
         
         # Process with OCR using direct base64 encoding
-        include_images = True  # Always extract images for compatibility
         ocr_result = _manager.process_ocr(pdf_path, pages_list, include_images)
         
         # Extract text from OCR result
@@ -336,7 +364,7 @@ def extract_text_from_pdf(
         metadata = {
             "source": "mistral_ocr",
             "model": "mistral-ocr-latest",
-            "pdf_path": pdf_path,
+            "pdf_path": None if isinstance(pdf_path, bytes) else pdf_path,
             "page_range": page_range,
             "pages_requested": pages_list,
             "pages_processed": page_indices,
@@ -4,11 +4,15 @@ S3 Storage Utility for document management
 import boto3
 import os
 import logging
+from threading import Lock
+from botocore.config import Config
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 from botocore.exceptions import ClientError, NoCredentialsError
 from datetime import datetime
 import mimetypes
+from io import BytesIO
+from urllib.parse import urlparse
 # from dotenv import load_dotenv, find_dotenv
 # # Load environment variables
 # load_dotenv()
@@ -16,6 +20,19 @@ import mimetypes
 
 logger = logging.getLogger(__name__)
 
+# Shared client settings: keep-alive connections and a pool large enough for
+# concurrent uploads from worker threads
+_S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    connect_timeout=3,
+    read_timeout=30
+)
+
+_s3_storage: Optional["S3DocumentStorage"] = None
+_s3_storage_lock = Lock()
+
 def extract_s3_key_from_url(s3_url: str, bucket_name: str, region_name: str) -> str:
     """
     Extract S3 key from S3 URL
@@ -23,7 +40,7 @@ def extract_s3_key_from_url(s3_url: str, bucket_name: str, region_name: str) ->
     Args:
         s3_url: Full S3 URL
         bucket_name: S3 bucket name
-        region_name: AWS region name
+        region_name: AWS region name (not needed to locate the key; kept for callers)
         
     Returns:
         S3 key extracted from URL
@@ -31,13 +48,14 @@ def extract_s3_key_from_url(s3_url: str, bucket_name: str, region_name: str) ->
     # Handle both URL formats:
     # https://bucket-name.s3.region.amazonaws.com/key
     # https://s3.region.amazonaws.com/bucket-name/key
-    if f'{bucket_name}.s3.{region_name}.amazonaws.com/' in s3_url:
-        return s3_url.split(f'{bucket_name}.s3.{region_name}.amazonaws.com/')[-1]
-    elif f's3.{region_name}.amazonaws.com/{bucket_name}/' in s3_url:
-        return s3_url.split(f's3.{region_name}.amazonaws.com/{bucket_name}/')[-1]
-    else:
-        # Fallback: try to extract everything after the last occurrence of bucket name
-        return s3_url.split('/')[-1]
+    parsed = urlparse(s3_url)
+    # Keys are embedded unencoded, so take everything after the host verbatim;
+    # parsed.path would stop at a '#' or '?' from an uploaded filename
+    s3_key = s3_url.split(parsed.netloc, 1)[1].lstrip('/') if parsed.netloc else s3_url.lstrip('/')
+    # Path-style URLs carry the bucket as the first path segment
+    if not parsed.netloc.startswith(f'{bucket_name}.') and s3_key.startswith(f'{bucket_name}/'):
+        s3_key = s3_key[len(bucket_name) + 1:]
+    return s3_key
 
 class S3DocumentStorage:
     """
@@ -63,6 +81,7 @@ class S3DocumentStorage:
             self.s3_client = boto3.client(
                 's3',
                 region_name=self.region_name,
+                config=_S3_CLIENT_CONFIG,
                 # aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
                 # aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
             )
@@ -155,6 +174,77 @@ class S3DocumentStorage:
                 'error': str(e)
             }
     
+    def upload_bytes(self,
+                     content: bytes,
+                     s3_key: str,
+                     metadata: Dict[str, str] = None,
+                     content_type: str = None) -> Dict[str, Any]:
+        """
+        Upload in-memory content to S3 with metadata, without a local temp file
+        
+        Args:
+            content: File content
+            s3_key: S3 object key (path in bucket)
+            metadata: Additional metadata to store with file
+            content_type: MIME type of file (guessed from s3_key if not provided)
+            
+        Returns:
+            Dictionary with upload result information (same shape as upload_file)
+        """
+        try:
+            key_path = Path(s3_key)
+            
+            # Auto-detect content type if not provided
+            if not content_type:
+                content_type, _ = mimetypes.guess_type(key_path.name)
+                if not content_type:
+                    content_type = 'application/octet-stream'
+            
+            # Prepare metadata
+            file_metadata = {
+                'original_filename': key_path.name,
+                'file_extension': key_path.suffix.lower(),
+                'file_size': str(len(content)),
+                'upload_timestamp': datetime.utcnow().isoformat(),
+                'content_type': content_type
+            }
+            
+            # Add custom metadata if provided
+            if metadata:
+                file_metadata.update(metadata)
+            
+            self.s3_client.upload_fileobj(
+                Fileobj=BytesIO(content),
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'Metadata': file_metadata
+                }
+            )
+            
+            # Generate S3 URL
+            s3_url = f"https://{self.bucket_name}.s3.{self.region_name}.amazonaws.com/{s3_key}"
+            
+            logger.info(f"Successfully uploaded {len(content)} bytes to s3://{self.bucket_name}/{s3_key}")
+            
+            return {
+                'success': True,
+                'bucket': self.bucket_name,
+                's3_key': s3_key,
+                's3_url': s3_url,
+                'content_type': content_type,
+                'metadata': file_metadata,
+                'file_size': file_metadata['file_size']
+            }
+            
+        except Exception as e:
+            logger.error(f"Error uploading content to S3: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def download_file(self, s3_key: str, local_file_path: str) -> Dict[str, Any]:
         """
         Download a file from S3
@@ -301,9 +391,15 @@ class S3DocumentStorage:
 
 def get_s3_storage() -> S3DocumentStorage:
     """
-    Factory function to get S3 storage instance
+    Get the shared S3 storage instance, so every caller reuses one client and its
+    pooled keep-alive connections (the bucket check also runs only once)
     
     Returns:
         S3DocumentStorage instance
     """
-    return S3DocumentStorage()
\ No newline at end of file
+    global _s3_storage
+    if _s3_storage is None:
+        with _s3_storage_lock:
+            if _s3_storage is None:
+                _s3_storage = S3DocumentStorage()
+    return _s3_storage
\ No newline at end of file
@@ -99,12 +99,15 @@ def get_current_username(credentials: HTTPBasicCredentials = Security(security))
 # Custom OpenAPI route that requires authentication
 @app.get("/openapi.json", include_in_schema=False)
 async def get_open_api_endpoint(username: str = Depends(get_current_username)):
-    return get_openapi(
-        title="Compliance System API",
-        version="1.0.0",
-        description="API for the Compliance System",
-        routes=app.routes,
-    )
+    # Building the schema walks every route and model, so do it once per process
+    if app.openapi_schema is None:
+        app.openapi_schema = get_openapi(
+            title="Compliance System API",
+            version="1.0.0",
+            description="API for the Compliance System",
+            routes=app.routes,
+        )
+    return app.openapi_schema
 
 # Custom Swagger UI route that requires authentication
 @app.get("/docs", include_in_schema=False)
@@ -86,6 +86,40 @@ def db():
     TestBase.metadata.drop_all(bind=engine)
 
 
+def _sqlite_app_metadata():
+    """Copy of the application tables with PostgreSQL-only column details swapped for SQLite ones"""
+    from sqlalchemy import MetaData, BigInteger, Integer, JSON, ARRAY, text
+    from sqlalchemy.schema import DefaultClause
+    from app.database.base import Base
+    import app.models  # noqa: F401 - registers every model on Base.metadata
+    
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    for table in metadata.tables.values():
+        for column in table.columns:
+            if column.server_default is not None and 'now()' in str(getattr(column.server_default, 'arg', '')):
+                column.server_default = DefaultClause(text("CURRENT_TIMESTAMP"))
+            if isinstance(column.type, BigInteger):
+                column.type = Integer()  # SQLite only autoincrements INTEGER primary keys
+            if isinstance(column.type, ARRAY):
+                column.type = JSON()
+    return metadata
+
+
+@pytest.fixture(scope="function")
+def models_db():
+    """Session on a fresh in-memory database with the application models' tables"""
+    models_engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool)
+    _sqlite_app_metadata().create_all(bind=models_engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=models_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        models_engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def client(db):
     # Import here to avoid circular imports
@@ -0,0 +1,24 @@
+import sys
+import uuid
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.audit import log_activity
+
+
+def test_log_activity_parses_user_id_and_commits(models_db):
+    user_id = uuid.uuid4()
+    
+    audit_log = log_activity(models_db, "login", user_id=str(user_id), details="ok")
+    
+    assert audit_log.user_id == user_id
+    assert audit_log.timestamp is not None
+
+
+def test_log_activity_drops_invalid_user_id(models_db):
+    audit_log = log_activity(models_db, "login", user_id="not-a-uuid")
+    
+    assert audit_log.user_id is None
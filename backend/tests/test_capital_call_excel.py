@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.capital_call_generator import capital_call_excel_generator as excel_module
+
+
+def _sample_data(investor):
+    return {
+        'notice_date': '07th April 2025',
+        'investor': investor,
+        'amount_due': 5000000,
+        'total_commitment': 10000000,
+        'amount_called_up': 2000000,
+        'remaining_commitment': 7500000,
+        'contribution_due_date': '22nd April, 2025',
+        'bank_name': 'SBI',
+        'ifsc': 'SBIN0009995',
+        'acct_name': 'AJVC FUND',
+        'acct_number': '43471853599',
+        'bank_contact': 'Aviral Bhatnagar',
+        'phone': '8758295844',
+        'forecast_next_quarter': 5,
+        'forecast_next_quarter_period': "Q2'25"
+    }
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    # Generators write under the relative default output directory, so run from tmp_path
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _sheet_values(path):
+    return [cell.value for row in openpyxl.load_workbook(path).active.iter_rows() for cell in row if cell.value]
+
+
+def test_notice_text_and_percentage(output_dir):
+    data = _sample_data("Anurag Agrawal")
+    generator = excel_module.CapitalCallExcelGenerator()
+    
+    values = _sheet_values(generator.generate_capital_call_excel(data))
+    
+    assert "Dear Anurag Agrawal," in values
+    assert "50% of your committed capital." in values
+    assert "Forecasted next quarter (Q2'25) drawdown: 5% of the committed amount." in values
+
+
+def test_zero_commitment_does_not_divide_by_zero(output_dir):
+    data = {**_sample_data("Zero Commitment"), 'total_commitment': 0}
+    
+    path = excel_module.CapitalCallExcelGenerator().generate_capital_call_excel(data)
+    
+    assert Path(path).exists()
+
+
+def test_filename_is_sanitized(output_dir):
+    path = Path(excel_module.CapitalCallExcelGenerator().generate_capital_call_excel(_sample_data("../A/B C\\D")))
+    
+    assert path.parent.resolve() == (output_dir / "uploads" / "capital_calls").resolve()
+    assert path.name.startswith("capital_call__A_B_C_D_")
@@ -0,0 +1,40 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.schemas.entity import EntityCreate, EntityResponse
+
+ENTITY_DATA = {
+    "entity_type": "Auditor",
+    "entity_pan": "abcde1234f",
+    "entity_name": "Audit Co",
+    "entity_address": "Mumbai",
+    "entity_telephone": "9876543210",
+    "entity_email": "audit@example.com",
+    "entity_poc": "Auditor POC",
+    "entity_registration_number": "REG123",
+}
+
+
+def test_create_normalizes_and_checks_pan():
+    assert EntityCreate(**ENTITY_DATA).entity_pan == "ABCDE1234F"
+    
+    with pytest.raises(ValidationError):
+        EntityCreate(**{**ENTITY_DATA, "entity_pan": "ABCD-1234F"})
+
+
+def test_response_reads_rows_stored_under_older_checks():
+    """Rows that passed the old length-only PAN check must still serialize"""
+    now = datetime.now()
+    response = EntityResponse(
+        **{**ENTITY_DATA, "entity_pan": "ABCD-1234F"}, entity_id=1, created_at=now, updated_at=now
+    )
+    
+    assert response.entity_pan == "ABCD-1234F"
@@ -0,0 +1,45 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import llm
+
+
+class _FakeAsyncOpenAI:
+    instances = []
+    
+    def __init__(self, api_key=None):
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        _FakeAsyncOpenAI.instances.append(self)
+    
+    async def _create(self, **kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(
+                logprobs=SimpleNamespace(content=[SimpleNamespace(logprob=0.0)]),
+                message=SimpleNamespace(content='{"ok": true}')
+            )],
+            system_fingerprint="fp_test"
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+
+def test_async_client_is_closed_after_each_call(monkeypatch):
+    monkeypatch.setattr(llm, "AsyncOpenAI", _FakeAsyncOpenAI)
+    _FakeAsyncOpenAI.instances.clear()
+    
+    result = asyncio.run(llm.aget_response_from_openai("system", "user"))
+    
+    assert result == '{"ok": true}'
+    assert len(_FakeAsyncOpenAI.instances) == 1
+    assert _FakeAsyncOpenAI.instances[0].closed
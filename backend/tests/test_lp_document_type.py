@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.lp_document_processor import LPDocumentProcessor
+from app.utils.constants import DOCUMENT_TYPES, DOCUMENT_KEYWORDS
+
+
+def _reference_document_type(filename: str, content: str = "") -> str:
+    """The original keyword loop: types in DOCUMENT_KEYWORDS order, filename or content"""
+    filename_lower = filename.lower()
+    content_lower = content.lower()
+    for doc_type, keywords in DOCUMENT_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in filename_lower or keyword in content_lower:
+                return DOCUMENT_TYPES[doc_type]
+    if "kyc" in filename_lower:
+        return DOCUMENT_TYPES["KYC"]
+    elif "contribution" in filename_lower or "agreement" in filename_lower:
+        return DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
+    elif "cml" in filename_lower or "master" in filename_lower:
+        return DOCUMENT_TYPES["CML"]
+    return DOCUMENT_TYPES["KYC"]
+
+
+def test_type_order_beats_earlier_match_position():
+    """'sha' inside 'shall' must not outrank a KYC keyword later in the content"""
+    processor = LPDocumentProcessor(db=None)
+    content = "The investor shall provide know your customer documents"
+    
+    assert processor.identify_document_type("upload.pdf", content) == DOCUMENT_TYPES["KYC"]
+
+
+def test_content_match_on_earlier_type_beats_filename_match():
+    processor = LPDocumentProcessor(db=None)
+    
+    assert processor.identify_document_type("client master list.pdf", "kyc form") == DOCUMENT_TYPES["KYC"]
+
+
+def test_filename_fallback_keeps_type_priority():
+    """'master' appears before 'agreement', but the agreement type ranks above CML"""
+    processor = LPDocumentProcessor(db=None)
+    
+    assert processor.identify_document_type("master_agreement.pdf") == DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
+    assert processor.identify_document_type("Master Agreement.pdf") == DOCUMENT_TYPES["CONTRIBUTION_AGREEMENT"]
+
+
+def test_matches_original_keyword_loop():
+    processor = LPDocumentProcessor(db=None)
+    filenames = [
+        "upload.pdf", "KYC_john.pdf", "contribution agreement.pdf", "CML_export.pdf",
+        "master.pdf", "master_agreement.pdf", "shareholders agreement.docx", "drawdown notice Q1.pdf", b"kyc_bytes.pdf"
+    ]
+    contents = [
+        "", "know your customer", "The investor shall pay", "subscription agreement signed",
+        "client master list attached", "capital call notice", "nothing relevant here"
+    ]
+    
+    for filename in filenames:
+        for content in contents:
+            expected = _reference_document_type(filename.decode() if isinstance(filename, bytes) else filename, content)
+            assert processor.identify_document_type(filename, content) == expected, (filename, content)
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.portfolio_document_processor import PortfolioDocumentProcessor
+
+
+def test_founders_returned_in_submitted_order(models_db):
+    processor = PortfolioDocumentProcessor(models_db)
+    names = [f"Founder {i}" for i in range(20)]
+    
+    founders = processor.create_founder_records_from_dict(
+        1, {name: {"email": f"f{i}@example.com", "role": "CEO"} for i, name in enumerate(names)}
+    )
+    
+    assert [founder.founder_name for founder in founders] == names
+    assert all(founder.founder_id for founder in founders)
+    assert [founder.founder_id for founder in founders] == sorted(founder.founder_id for founder in founders)
+
+
+def test_legacy_founder_records_match_names_by_position(models_db):
+    processor = PortfolioDocumentProcessor(models_db)
+    
+    founders = processor.create_founder_records(
+        1,
+        [{"founder_email": "a@example.com", "founder_role": "CEO"}, {"founder_email": "b@example.com", "founder_role": "CTO"}],
+        ["Alice", "Bob"]
+    )
+    
+    assert [(f.founder_name, f.founder_email, f.founder_role) for f in founders] == [
+        ("Alice", "a@example.com", "CEO"), ("Bob", "b@example.com", "CTO")
+    ]
+
+
+def test_no_founders_issues_no_insert(models_db):
+    assert PortfolioDocumentProcessor(models_db).create_founder_records_from_dict(1, {}) == []
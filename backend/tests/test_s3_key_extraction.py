@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.s3_storage import extract_s3_key_from_url
+
+BUCKET = "ajvc-documents"
+REGION = "ap-south-1"
+
+
+def test_virtual_hosted_url():
+    url = f"https://{BUCKET}.s3.{REGION}.amazonaws.com/Fund_A/FY25Q1/Capital Calls/lp.pdf"
+    assert extract_s3_key_from_url(url, BUCKET, REGION) == "Fund_A/FY25Q1/Capital Calls/lp.pdf"
+
+
+def test_path_style_url_strips_bucket():
+    url = f"https://s3.{REGION}.amazonaws.com/{BUCKET}/Fund_A/FY25Q1/Capital Calls/lp.pdf"
+    assert extract_s3_key_from_url(url, BUCKET, REGION) == "Fund_A/FY25Q1/Capital Calls/lp.pdf"
+
+
+def test_key_with_hash_question_mark_and_spaces():
+    """Uploaded filenames end up in the key unencoded and must survive intact"""
+    key = "Fund_A/FY25Q1/Bank Statements/stmt #3 ?v2_20250101_120000.pdf"
+    virtual_hosted = f"https://{BUCKET}.s3.{REGION}.amazonaws.com/{key}"
+    path_style = f"https://s3.{REGION}.amazonaws.com/{BUCKET}/{key}"
+    
+    assert extract_s3_key_from_url(virtual_hosted, BUCKET, REGION) == key
+    assert extract_s3_key_from_url(path_style, BUCKET, REGION) == key
@@ -0,0 +1,79 @@
+import sys
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import openpyxl
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import unit_allotment_excel_generator as excel_module
+
+
+class _FakeS3Storage:
+    def __init__(self):
+        self.uploads = []
+    
+    def upload_bytes(self, content, s3_key, metadata=None, content_type=None):
+        self.uploads.append((s3_key, content, metadata))
+        return {'success': True, 's3_key': s3_key, 's3_url': f"https://bucket.s3.ap-south-1.amazonaws.com/{s3_key}"}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(excel_module, "get_s3_storage", _FakeS3Storage)
+    return excel_module.UnitAllotmentExcelGenerator()
+
+
+def _allotment(name, drawdown_amount, allotted_units, nav_value=100):
+    return SimpleNamespace(
+        first_holder_name=name, first_holder_pan="ABCDE1234F",
+        second_holder_name=None, second_holder_pan=None, third_holder_name=None, third_holder_pan=None,
+        depository="CDSL", dpid="12081600", clid="1208160000000001",
+        allotted_units=allotted_units, nav_value=nav_value, date_of_allotment=date(2025, 4, 15),
+        committed_amt=Decimal("1000000.00"), drawdown_amount=drawdown_amount,
+        mgmt_fees=Decimal("14750.00"), amt_accepted=drawdown_amount,
+        bank_account_no=None, bank_account_name=None, micr_code=None, bank_ifsc=None,
+        stamp_duty=Decimal("12.50"), status="Generated", drawdown_date=date(2025, 4, 1),
+        drawdown_quarter="FY26Q1"
+    )
+
+
+ALLOTMENTS = [
+    _allotment("LP One", Decimal("250000.00"), 2500),
+    _allotment("LP Two", Decimal("100000.00"), 900),  # unit calculation mismatch
+    _allotment("", Decimal("0"), 0),  # missing name, amount and units
+]
+
+
+def test_report_matches_separate_validation_and_summary(generator):
+    report = generator.generate_allotment_sheet_with_report(iter(ALLOTMENTS), "AJVC Fund I", "FY26Q1")
+    
+    expected_summary = generator.get_allotment_summary(ALLOTMENTS)
+    summary = report['summary']
+    assert summary.pop('generation_date') and expected_summary.pop('generation_date')
+    assert summary == expected_summary
+    assert report['validation_errors'] == generator.validate_allotment_data(ALLOTMENTS)
+    assert report['validation_errors']['invalid_calculations']
+    assert report['s3_url'].endswith(".xlsx")
+
+
+def test_sheet_has_header_and_one_row_per_allotment(generator):
+    generator.generate_allotment_sheet(ALLOTMENTS, "AJVC Fund I", "FY26Q1")
+    
+    s3_key, content, metadata = generator.s3_storage.uploads[0]
+    rows = list(openpyxl.load_workbook(BytesIO(content)).active.iter_rows(values_only=True))
+    assert rows[0][0] == 'FIRST-HOLDER-NAME'
+    assert [row[0] for row in rows[1:]] == ["LP One", "LP Two", None]
+    assert metadata['total_lps'] == '3'
+    assert s3_key.startswith("AJVC_Fund_I/FY26Q1/Unit allotment/")
+
+
+def test_empty_allotments_raise(generator):
+    with pytest.raises(ValueError):
+        generator.generate_allotment_sheet([], "AJVC Fund I", "FY26Q1")
@@ -0,0 +1,99 @@
+import random
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.unit_calculator import UnitCalculationEngine, default_engine
+
+NAV = 100
+MGMT_FEE_RATE = Decimal('0.0125')
+STAMP_DUTY_RATE = Decimal('0.00005')
+
+
+def _random_drawdowns(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        (
+            Decimal(rng.randint(1, 10**9)) / 100,  # drawdown amount, paise precision
+            Decimal(rng.randint(10**6, 10**11)) / 100,  # commitment amount
+            date(2025, rng.randint(1, 12), rng.randint(1, 28))
+        )
+        for _ in range(count)
+    ]
+
+
+def test_batch_matches_per_lp_calculation():
+    engine = UnitCalculationEngine()
+    drawdowns = _random_drawdowns(500)
+    
+    batch = engine.calculate_all_batch(drawdowns, NAV, MGMT_FEE_RATE, STAMP_DUTY_RATE)
+    
+    assert len(batch) == len(drawdowns)
+    for (drawdown_amount, commitment_amount, drawdown_date), result in zip(drawdowns, batch):
+        expected = engine.calculate_all_for_drawdown(
+            drawdown_amount, NAV, commitment_amount, MGMT_FEE_RATE, STAMP_DUTY_RATE, drawdown_date
+        )
+        assert result == expected
+
+
+def test_amounts_round_half_up_to_paise():
+    # 100 * 0.00005 = 0.005 exactly: half-up gives 0.01 where banker's rounding would give 0.00
+    result = default_engine.calculate_all_batch(
+        [(Decimal('100'), Decimal('1000'), date(2025, 4, 1))], NAV, MGMT_FEE_RATE, STAMP_DUTY_RATE
+    )[0]
+    
+    assert result['stamp_duty'] == Decimal('0.01')
+    assert result['mgmt_fees'] == Decimal('14.75')  # 1000 * 0.0125 * 1.18
+    assert result['allotted_units'] == Decimal('1')
+
+
+def test_batch_error_names_failing_position():
+    drawdowns = _random_drawdowns(3)
+    drawdowns[1] = (Decimal('0'), drawdowns[1][1], drawdowns[1][2])
+    
+    with pytest.raises(ValueError, match="drawdown 2: .*drawdown_amount"):
+        default_engine.calculate_all_batch(drawdowns, NAV, MGMT_FEE_RATE, STAMP_DUTY_RATE)
+
+
+def test_batch_missing_commitment_is_rejected():
+    with pytest.raises(ValueError, match="drawdown 1: .*commitment_amount"):
+        default_engine.calculate_all_batch(
+            [(Decimal('1000'), None, date(2025, 4, 1))], NAV, MGMT_FEE_RATE, STAMP_DUTY_RATE
+        )
+
+
+def test_batch_rejects_invalid_fund_inputs_like_per_lp_path():
+    drawdown_amount, commitment_amount, drawdown_date = _random_drawdowns(1)[0]
+    
+    with pytest.raises(ValueError, match="nav_value") as batch_error:
+        default_engine.calculate_all_batch([(drawdown_amount, commitment_amount, drawdown_date)], 0, MGMT_FEE_RATE, STAMP_DUTY_RATE)
+    with pytest.raises(ValueError) as per_lp_error:
+        default_engine.calculate_all_for_drawdown(drawdown_amount, 0, commitment_amount, MGMT_FEE_RATE, STAMP_DUTY_RATE, drawdown_date)
+    assert str(batch_error.value) == str(per_lp_error.value)
+
+
+def test_validate_and_coerce_returns_decimal_inputs():
+    inputs, errors = default_engine.validate_and_coerce({
+        'drawdown_amount': '1000.50',
+        'nav_value': '100',
+        'commitment_amount': 5000,
+        'mgmt_fee_rate': 0.0125,
+        'stamp_duty_rate': Decimal('0.00005'),
+        'drawdown_date': date(2025, 4, 1)
+    })
+    
+    assert errors == {}
+    assert inputs['drawdown_amount'] == Decimal('1000.50')
+    assert inputs['nav_value'] == 100
+    assert inputs['mgmt_fee_rate'] == Decimal('0.0125')
+    assert default_engine.validate_calculation_inputs({'nav_value': 0}) == {
+        field: f"{field} is required"
+        for field in ('drawdown_amount', 'commitment_amount', 'mgmt_fee_rate', 'stamp_duty_rate', 'drawdown_date')
+    } | {'nav_value': "NAV value must be greater than 0"}